@@ -0,0 +1,39 @@
+"""Concurrency helpers for the IRR Prefix Lookup API."""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key onto one worker-thread call.
+
+    The first caller for a key runs ``fn`` in a thread; callers arriving while
+    it is still in flight await the same future instead of starting their own.
+    The entry is dropped as soon as the call completes, so later callers start
+    a fresh call (result caching is the client's job, not this class's).
+
+    Calls run on ``executor`` when given, which bounds how many can run at
+    once independently of the event loop's shared default thread pool.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None):
+        self._executor = executor
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        fut = self._inflight.get(key)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.run_in_executor(self._executor, fn, *args)
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._forget(key, f))
+        # Shield so one cancelled caller does not cancel the call for the rest.
+        return await asyncio.shield(fut)
+
+    def _forget(self, key: Hashable, fut: asyncio.Future) -> None:
+        if self._inflight.get(key) is fut:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -1,10 +1,11 @@
-"""FastAPI dependency injection for BGPQ4Client, auth, and DB."""
+"""FastAPI dependency injection for BGPQ4Client, fetch coordination, auth, and DB."""
 
 from fastapi import Request, HTTPException, Security
 from fastapi.security import APIKeyHeader
 
-from app.bgpq4_client import BGPQ4Client
+from app.bgpq4_client import BGPQ4Client, TTLCache
 from app.store import SnapshotStore
+from api.concurrency import SingleFlight
 from api.settings import settings
 
 
@@ -17,6 +18,16 @@ def get_bgpq4_client(request: Request) -> BGPQ4Client:
     return request.app.state.bgpq4_client
 
 
+def get_fetch_flights(request: Request) -> SingleFlight:
+    """Retrieve the shared single-flight coordinator for bgpq4 fetches."""
+    return request.app.state.fetch_flights
+
+
+def get_hot_responses(request: Request) -> TTLCache:
+    """Retrieve the app's cache of serialized prefix responses."""
+    return request.app.state.hot_responses
+
+
 # ---------------------------------------------------------------------------
 # Shared store (opened once in lifespan, used by dashboard endpoints)
 # ---------------------------------------------------------------------------
@@ -1,25 +1,34 @@
 """FastAPI application for IRR Prefix Lookup API."""
 
-import asyncio
+import hashlib
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import ValidationError
+from pydantic import BaseModel
 
-from app.bgpq4_client import BGPQ4Client
-from app.config import load_config
+from app.bgpq4_client import BGPQ4Client, PrefixResult, TTLCache
+from app.config import load_config_cached
 from app.diff import compute_diff
 from app.store import SnapshotStore
-from api.dependencies import get_bgpq4_client, get_store, verify_api_key
+from api.concurrency import SingleFlight
+from api.dependencies import (
+    get_bgpq4_client,
+    get_fetch_flights,
+    get_hot_responses,
+    get_store,
+    verify_api_key,
+)
 from api.schemas import (
     DiffHistoryResponse,
     DiffOut,
@@ -37,9 +46,12 @@ from api.schemas import (
     TargetSummary,
     TargetsResponse,
     TicketOut,
+    normalize_target,
 )
 from api.settings import settings
 
+_ASN_RE = re.compile(r"^AS\d+$")
+
 
 # ---------------------------------------------------------------------------
 # Logging setup
@@ -59,7 +71,7 @@ def _setup_logging() -> None:
 
 
 # ---------------------------------------------------------------------------
-# Application lifespan — create / destroy the shared BGPQ4Client and SnapshotStore
+# Application lifespan — create / destroy the shared BGPQ4Client, fetch pool and SnapshotStore
 # ---------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -69,14 +81,36 @@ async def lifespan(app: FastAPI):
         timeout=settings.bgpq4_timeout,
         sources=settings.bgpq4_sources_list,
         aggregate=settings.bgpq4_aggregate,
+        cache_ttl=settings.bgpq4_cache_ttl,
+        cache_size=settings.bgpq4_cache_size,
+        persistent=settings.bgpq4_persistent,
+    )
+    # Serialized PrefixResponse bodies for targets answered from the client
+    # cache, as (v4, v6, body, etag) keyed by target. An entry is only
+    # reused while the client still returns the prefix tuples it holds (held,
+    # so never recycled), so a refresh invalidates it. It shares the
+    # client's TTL and size, so it also ages out with the entry it mirrors.
+    app.state.hot_responses = TTLCache(
+        maxsize=settings.bgpq4_cache_size, ttl=settings.bgpq4_cache_ttl
+    )
+    # Duplicate concurrent lookups for one target share a single bgpq4 run,
+    # and distinct lookups run on a dedicated bounded pool so bursts cannot
+    # fork an unbounded number of bgpq4/WSL processes or starve other sync
+    # handlers.
+    fetch_executor = ThreadPoolExecutor(
+        max_workers=settings.max_concurrent_queries,
+        thread_name_prefix="irr-fetch",
     )
+    app.state.fetch_flights = SingleFlight(executor=fetch_executor)
     db_path = settings.db_path
     store = SnapshotStore(db_path)
     store.migrate()
     app.state.store = store
     logging.getLogger("app").info("IRR Prefix Lookup API started (BGPQ4)")
     yield
+    fetch_executor.shutdown(wait=False, cancel_futures=True)
     store.close()
+    app.state.hot_responses.clear()
     app.state.bgpq4_client.close()
     logging.getLogger("app").info("IRR Prefix Lookup API stopped")
 
@@ -96,7 +130,8 @@ app = FastAPI(
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
+    allow_origins=settings.cors_origins_list,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -105,12 +140,97 @@ app.add_middleware(
 # ---------------------------------------------------------------------------
 # Shared helper
 # ---------------------------------------------------------------------------
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model straight to JSON bytes with pydantic-core.
+
+    Used for the prefix-list payloads, which can hold tens of thousands of
+    strings: returning a Response skips FastAPI's jsonable_encoder pass and
+    stdlib json.dumps, leaving one Rust-side serialization.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _prefix_etag(result: PrefixResult) -> str:
+    """Strong ETag over the prefix lists and errors of a fetch result."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update("\n".join(result.ipv4_prefixes).encode())
+    h.update(b"|")
+    h.update("\n".join(result.ipv6_prefixes).encode())
+    h.update(b"|")
+    h.update("\n".join(result.errors).encode())
+    return f'"{h.hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+
+
+def _not_modified(
+    etag: str,
+    fetched_at: Optional[float],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """Evaluate the conditional-GET headers against a prefix result.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    it is absent (RFC 9110 section 13.2.2), and compares at the one-second
+    resolution of HTTP dates.
+    """
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+    if not if_modified_since or fetched_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(fetched_at) <= since
+
+
+def _prefix_response(
+    body: Optional[bytes],
+    etag: str,
+    fetched_at: Optional[float],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"max-age={max(settings.bgpq4_cache_ttl, 0)}",
+    }
+    if fetched_at is not None:
+        headers["Last-Modified"] = formatdate(fetched_at, usegmt=True)
+    if _not_modified(etag, fetched_at, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 async def _do_fetch(
     target: str,
     client: BGPQ4Client,
-) -> PrefixResponse:
+    flights: SingleFlight,
+    hot_responses: TTLCache,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> Response:
     start = time.perf_counter()
-    result = await asyncio.to_thread(client.fetch_prefixes, target)
+    # A fully cached target is answered inline; only misses pay the thread hop.
+    result = client.cached_prefixes(target)
+    if result is not None:
+        hot = hot_responses.get(target)
+        if hot and hot[0] is result.ipv4_prefixes and hot[1] is result.ipv6_prefixes:
+            return _prefix_response(
+                hot[2], hot[3], result.fetched_at, if_none_match, if_modified_since
+            )
+        cached = True
+    else:
+        result = await flights.do(target, client.fetch_prefixes, target)
+        cached = False
     elapsed_ms = int((time.perf_counter() - start) * 1000)
 
     # If no prefixes were retrieved at all and there are errors, fail with 502
@@ -124,18 +244,27 @@ async def _do_fetch(
             },
         )
 
-    return PrefixResponse(
+    etag = _prefix_etag(result)
+    # A revalidation hit needs no body, unless it is worth keeping as a hot
+    # response for the next unconditional request.
+    if not cached and _not_modified(etag, result.fetched_at, if_none_match, if_modified_since):
+        return _prefix_response(None, etag, result.fetched_at, if_none_match, if_modified_since)
+
+    body = PrefixResponse(
         target=target,
-        ipv4_prefixes=sorted(result.ipv4_prefixes),
-        ipv6_prefixes=sorted(result.ipv6_prefixes),
+        ipv4_prefixes=result.ipv4_prefixes,  # already sorted by the client
+        ipv6_prefixes=result.ipv6_prefixes,
         ipv4_raw_count=result.ipv4_raw_count,
         ipv4_count=len(result.ipv4_prefixes),
         ipv6_raw_count=result.ipv6_raw_count,
         ipv6_count=len(result.ipv6_prefixes),
         sources_queried=result.sources_queried,
         errors=result.errors,
-        query_time_ms=elapsed_ms,
-    )
+        query_time_ms=0 if cached else elapsed_ms,
+    ).model_dump_json().encode()
+    if cached:
+        hot_responses.set(target, (result.ipv4_prefixes, result.ipv6_prefixes, body, etag))
+    return _prefix_response(body, etag, result.fetched_at, if_none_match, if_modified_since)
 
 
 # ---------------------------------------------------------------------------
@@ -159,9 +288,11 @@ async def health():
 async def fetch_prefixes(
     body: FetchRequest,
     client: BGPQ4Client = Depends(get_bgpq4_client),
+    flights: SingleFlight = Depends(get_fetch_flights),
+    hot_responses: TTLCache = Depends(get_hot_responses),
 ):
     """Fetch IPv4/IPv6 prefixes for a target ASN or AS-SET."""
-    return await _do_fetch(body.target, client)
+    return await _do_fetch(body.target, client, flights, hot_responses)
 
 
 @app.get(
@@ -173,13 +304,21 @@ async def fetch_prefixes(
 async def get_prefixes(
     target: str,
     client: BGPQ4Client = Depends(get_bgpq4_client),
+    flights: SingleFlight = Depends(get_fetch_flights),
+    hot_responses: TTLCache = Depends(get_hot_responses),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
 ):
     """Convenience GET endpoint for quick prefix lookups."""
+    # Validate the path parameter directly; building a FetchRequest model
+    # just to run its validator costs a full Pydantic validation pass.
     try:
-        req = FetchRequest(target=target)
-    except ValidationError as e:
+        target = normalize_target(target)
+    except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    return await _do_fetch(req.target, client)
+    return await _do_fetch(
+        target, client, flights, hot_responses, if_none_match, if_modified_since
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -219,11 +358,12 @@ async def get_overview(store: SnapshotStore = Depends(get_store)):
 )
 async def trigger_run(
     bgpq4_client: BGPQ4Client = Depends(get_bgpq4_client),
+    flights: SingleFlight = Depends(get_fetch_flights),
     store: SnapshotStore = Depends(get_store),
 ):
     """Trigger a fetch+diff run for all configured targets."""
     try:
-        config = load_config(settings.config_path)
+        config = load_config_cached(settings.config_path)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="config.yaml not found")
 
@@ -234,26 +374,31 @@ async def trigger_run(
 
     for target in config.targets:
         try:
-            fetch_result = await asyncio.to_thread(bgpq4_client.fetch_prefixes, target)
+            # A run records a fresh reading, so it skips the prefix cache. It
+            # has its own flight key: a lookup in flight may be serving one
+            # address family from the cache.
+            fetch_result = await flights.do(
+                (target, "run"), bgpq4_client.fetch_prefixes, target, False
+            )
 
             if fetch_result.errors and not fetch_result.ipv4_prefixes and not fetch_result.ipv6_prefixes:
                 errors.append(f"{target}: fetch failed — {fetch_result.errors}")
                 continue
 
-            target_type = "asn" if re.match(r"^AS\d+$", target) else "as-set"
+            target_type = "asn" if _ASN_RE.match(target) else "as-set"
             lookback_seconds = config.diff.lookback_hours * 3600
             current_time = int(time.time())
             cutoff_time = current_time - lookback_seconds
             previous = store.get_snapshot_before(target, cutoff_time)
 
-            snapshot_id = store.save_snapshot(
+            snapshot = store.create_snapshot(
                 target=target,
                 target_type=target_type,
                 irr_sources=list(fetch_result.sources_queried),
-                ipv4_prefixes=list(fetch_result.ipv4_prefixes),
-                ipv6_prefixes=list(fetch_result.ipv6_prefixes),
+                ipv4_prefixes=fetch_result.ipv4_prefixes,
+                ipv6_prefixes=fetch_result.ipv6_prefixes,
             )
-            snapshot = store.get_snapshot_by_id(snapshot_id)
+            snapshot_id = snapshot.id
 
             diff = compute_diff(snapshot, previous)
 
@@ -391,15 +536,15 @@ def _diff_to_response(d) -> DiffResponse:
 )
 def list_targets_summary(store: SnapshotStore = Depends(get_store)):
     """List all monitored targets with their latest snapshot summary."""
-    snapshots = store.get_all_targets()
+    snapshots = store.get_all_targets_summary()
     summaries = [
         TargetSummary(
             target=s.target,
             target_type=s.target_type,
-            ipv4_count=len(s.ipv4_prefixes),
-            ipv6_count=len(s.ipv6_prefixes),
+            ipv4_count=s.ipv4_count,
+            ipv6_count=s.ipv6_count,
             last_snapshot=_fmt_ts(s.timestamp),
-            sources=s.irr_sources,
+            sources=list(s.irr_sources),
         )
         for s in snapshots
     ]
@@ -417,7 +562,7 @@ def get_latest_snapshot(target: str, store: SnapshotStore = Depends(get_store)):
     snapshot = store.get_latest_snapshot(target.upper())
     if not snapshot:
         raise HTTPException(status_code=404, detail=f"No snapshot found for {target.upper()}")
-    return _snapshot_to_response(snapshot)
+    return _json_response(_snapshot_to_response(snapshot))
 
 
 @app.get(
@@ -433,10 +578,10 @@ def get_snapshot_history(
 ):
     """Get snapshot history for a target (newest first)."""
     snapshots = store.get_snapshot_history(target.upper(), limit)
-    return SnapshotHistoryResponse(
+    return _json_response(SnapshotHistoryResponse(
         target=target.upper(),
         snapshots=[_snapshot_to_response(s) for s in snapshots],
-    )
+    ))
 
 
 @app.get(
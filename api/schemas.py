@@ -8,6 +8,24 @@ from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validat
 
 T = TypeVar("T")
 
+# ASN: AS15169 (AS followed by digits)
+# AS-SET: AS-GOOGLE or AS-GOOGLE:EXAMPLE (AS- followed by alphanumeric/hyphen/colon)
+_TARGET_RE = re.compile(r"^AS(\d+|-[A-Z0-9][-A-Z0-9:]*)$")
+
+
+def normalize_target(v: str) -> str:
+    """Upper-case and validate an ASN / AS-SET, raising ValueError if invalid."""
+    v = v.strip().upper()
+    # Plain ASNs are the common case; check them without the regex.
+    # isascii() keeps non-ASCII digits such as "²" out, as \d would.
+    if v.startswith("AS") and v[2:].isascii() and v[2:].isdigit():
+        return v
+    if not _TARGET_RE.match(v):
+        raise ValueError(
+            "target must be a valid ASN (e.g. AS15169) or AS-SET (e.g. AS-GOOGLE or AS-GOOGLE:EXAMPLE)"
+        )
+    return v
+
 
 class FetchRequest(BaseModel):
     target: str
@@ -15,14 +33,7 @@ class FetchRequest(BaseModel):
     @field_validator("target")
     @classmethod
     def validate_target(cls, v: str) -> str:
-        v = v.strip().upper()
-        # ASN: AS15169 (AS followed by digits)
-        # AS-SET: AS-GOOGLE or AS-GOOGLE:EXAMPLE (AS- followed by alphanumeric/hyphen/colon)
-        if not re.match(r"^AS(\d+|-[A-Z0-9][-A-Z0-9:]*)$", v):
-            raise ValueError(
-                "target must be a valid ASN (e.g. AS15169) or AS-SET (e.g. AS-GOOGLE or AS-GOOGLE:EXAMPLE)"
-            )
-        return v
+        return normalize_target(v)
 
 
 class PrefixResponse(BaseModel):
@@ -131,7 +142,7 @@ class AddTargetRequest(BaseModel):
     @classmethod
     def validate_target(cls, v: str) -> str:
         v = v.strip().upper()
-        if not re.match(r"^AS(\d+|-[A-Z0-9][-A-Z0-9:]*)$", v):
+        if not _TARGET_RE.match(v):
             raise ValueError("target must be an ASN (AS12345) or AS-SET (AS-FOO:BAR)")
         return v
 
@@ -1,5 +1,7 @@
 """Environment-based configuration for the IRR Prefix Lookup API."""
 
+from functools import cached_property
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,10 @@ class Settings(BaseSettings):
     bgpq4_sources: str = "RADB,RIPE,ARIN,APNIC,LACNIC,AFRINIC,RPKI"  # Comma-separated IRR sources
     bgpq4_timeout: int = 120
     bgpq4_aggregate: bool = True
+    bgpq4_cache_ttl: int = 300           # Seconds to cache bgpq4 results in memory; 0 disables
+    bgpq4_cache_size: int = 1024         # Max cached (target, address family) results
+    bgpq4_persistent: bool = False       # Reuse long-lived bgpq4 helper shells (amortizes WSL startup)
+    max_concurrent_queries: int = 8       # Max fetches running at once (2 bgpq4 processes each; persistent mode queues on its 2 helpers)
     log_level: str = "INFO"
     cors_origins: str = "*"
     api_key: str = ""                     # Set IRR_API_API_KEY to require auth on all endpoints
@@ -16,15 +22,22 @@ class Settings(BaseSettings):
 
     model_config = {"env_prefix": "IRR_API_"}
 
-    @property
+    # Parsed once on first access; settings are not mutated after startup.
+    @cached_property
     def bgpq4_cmd_list(self) -> list[str] | None:
         if not self.bgpq4_cmd.strip():
             return None  # let BGPQ4Client auto-detect
         return [s.strip() for s in self.bgpq4_cmd.split(",")]
 
-    @property
+    @cached_property
     def bgpq4_sources_list(self) -> list[str]:
         return [s.strip() for s in self.bgpq4_sources.split(",") if s.strip()]
 
+    @cached_property
+    def cors_origins_list(self) -> list[str]:
+        if self.cors_origins.strip() == "*":
+            return ["*"]  # Starlette short-circuits the origin check for a lone "*"
+        return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
+
 
 settings = Settings()
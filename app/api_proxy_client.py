@@ -6,21 +6,32 @@ Set `api_url` in config.yaml to enable:
     api_url: "https://your-deployed-api.azurecontainerapps.io"
 """
 
+import json
 import logging
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import (
-    retry,
+    Retrying,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception_type,
     before_sleep_log,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 from app.bgpq4_client import PrefixResult, BGPQ4ClientError
 
 logger = logging.getLogger("app.api_proxy_client")
 
+# Prefix responses for large AS-SETs run to thousands of entries; orjson
+# decodes the raw body bytes several times faster than response.json().
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 class APIProxyClient:
     """Client that fetches prefixes via the deployed IRR Prefix Lookup API."""
@@ -34,7 +45,21 @@ class APIProxyClient:
         self.api_url = api_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
+        # Built once; tenacity keeps per-call retry state thread-local, so the
+        # instance is safe to share between concurrent callers.
+        self._retrying = Retrying(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_exponential(multiplier=1, min=2, max=30),
+            retry=retry_if_exception_type((requests.RequestException, BGPQ4ClientError)),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
+            reraise=True,
+        )
         self._session = requests.Session()
+        # Keep a larger pool of keep-alive connections than requests' default
+        # (10 per host) so bursts reuse TLS sessions; retries are left to tenacity.
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._session.headers.update({
             "Content-Type": "application/json",
             "User-Agent": "irr-automation/2.0 (proxy)",
@@ -48,18 +73,8 @@ class APIProxyClient:
         return self._fetch_with_retry(target)
 
     def _fetch_with_retry(self, target: str) -> PrefixResult:
-        @retry(
-            stop=stop_after_attempt(self.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=30),
-            retry=retry_if_exception_type((requests.RequestException, BGPQ4ClientError)),
-            before_sleep=before_sleep_log(logger, logging.WARNING),
-            reraise=True,
-        )
-        def _do_fetch():
-            return self._execute_fetch(target)
-
         try:
-            return _do_fetch()
+            return self._retrying(self._execute_fetch, target)
         except requests.RequestException as e:
             raise BGPQ4ClientError(
                 f"API proxy request failed after {self.max_retries} attempts: {e}"
@@ -104,11 +119,14 @@ class APIProxyClient:
                 f"API returned status {response.status_code}: {response.text[:200]}"
             )
 
-        data = response.json()
+        try:
+            data = _json_loads(response.content)
+        except ValueError as e:  # json and orjson decode errors both subclass it
+            raise BGPQ4ClientError(f"API returned invalid JSON: {e}")
 
         result = PrefixResult(
-            ipv4_prefixes=set(data.get("ipv4_prefixes", [])),
-            ipv6_prefixes=set(data.get("ipv6_prefixes", [])),
+            ipv4_prefixes=data.get("ipv4_prefixes", []),
+            ipv6_prefixes=data.get("ipv6_prefixes", []),
             sources_queried=data.get("sources_queried", []),
             errors=data.get("errors", []),
         )
@@ -8,25 +8,45 @@ in a single command, replacing the multi-source WHOIS/REST approach.
 import ipaddress
 import json
 import logging
+import os
+import shlex
 import shutil
+import signal
 import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass, field
-from typing import List, Set
+from typing import BinaryIO, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is an optional memory saver
+    ijson = None
 
 logger = logging.getLogger("app.bgpq4_client")
 
+# bgpq4 output up to this size is read whole and parsed in one pass; beyond
+# it (huge AS-SETs), ijson, when installed, decodes the rest off the pipe.
+_STREAM_PARSE_THRESHOLD = 4 * 1024 * 1024
 
-def collapse_prefixes(prefixes: Set[str]) -> Set[str]:
-    """Collapse/aggregate a set of prefix strings using ipaddress.collapse_addresses().
+# orjson parses bgpq4's (potentially multi-MB) output several times faster;
+# both accept bytes directly, so stdout never needs decoding first.
+_json_loads = orjson.loads if orjson is not None else json.loads
 
-    Removes covered subnets and merges adjacent networks into the minimal set
-    of supernets. Skips any invalid prefix strings.
 
-    Args:
-        prefixes: Set of CIDR prefix strings (e.g., {"10.0.0.0/16", "10.0.1.0/24"}).
+def _collapse_networks(prefixes: Iterable[str]) -> list:
+    """Parse and collapse prefix strings into networks in numeric order.
 
-    Returns:
-        Minimal set of non-overlapping, non-adjacent prefix strings.
+    IPv4 networks come first, each family sorted by address then length —
+    collapse_addresses() already yields its output in that order.
     """
     networks = []
     for p in prefixes:
@@ -35,27 +55,138 @@ def collapse_prefixes(prefixes: Set[str]) -> Set[str]:
         except ValueError:
             logger.warning(f"Skipping invalid prefix: {p}")
     try:
-        return {str(n) for n in ipaddress.collapse_addresses(networks)}
+        return list(ipaddress.collapse_addresses(networks))
     except TypeError:
         # collapse_addresses raises TypeError when IPv4 and IPv6 are mixed.
-        # Collapse each family separately and union the results.
+        # Collapse each family separately and concatenate the results.
         v4 = [n for n in networks if n.version == 4]
         v6 = [n for n in networks if n.version == 6]
         return (
-            {str(n) for n in ipaddress.collapse_addresses(v4)} |
-            {str(n) for n in ipaddress.collapse_addresses(v6)}
+            list(ipaddress.collapse_addresses(v4)) +
+            list(ipaddress.collapse_addresses(v6))
         )
 
 
-@dataclass
+def collapse_prefixes(prefixes: Set[str]) -> Set[str]:
+    """Collapse/aggregate a set of prefix strings using ipaddress.collapse_addresses().
+
+    Removes covered subnets and merges adjacent networks into the minimal set
+    of supernets. Skips any invalid prefix strings.
+
+    Args:
+        prefixes: Set of CIDR prefix strings (e.g., {"10.0.0.0/16", "10.0.1.0/24"}).
+
+    Returns:
+        Minimal set of non-overlapping, non-adjacent prefix strings.
+    """
+    return {str(n) for n in _collapse_networks(prefixes)}
+
+
+@dataclass(slots=True)
 class PrefixResult:
-    """Result of fetching prefixes from IRR."""
-    ipv4_prefixes: Set[str] = field(default_factory=set)
-    ipv6_prefixes: Set[str] = field(default_factory=set)
+    """Result of fetching prefixes from IRR.
+
+    BGPQ4Client fills the prefix sequences with tuples of aggregated
+    prefixes already in numeric order, so consumers can emit them without
+    re-sorting. The tuples are shared with the client's cache rather than
+    copied; being immutable, they are safe to hand across threads.
+
+    fetched_at is the Unix time the prefixes were fetched from the IRR, or
+    None when the producer does not track it.
+    """
+    ipv4_prefixes: Sequence[str] = ()
+    ipv6_prefixes: Sequence[str] = ()
     ipv4_raw_count: int = 0   # prefix count before Python aggregation
     ipv6_raw_count: int = 0   # prefix count before Python aggregation
     sources_queried: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    fetched_at: Optional[float] = None
+
+
+class _PrefixedReader:
+    """Binary reader returning already-read bytes before the rest of a stream."""
+
+    def __init__(self, head: bytes, stream: BinaryIO):
+        self._head = memoryview(head)
+        self._pos = 0
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self._pos < len(self._head):
+            end = len(self._head) if size < 0 else self._pos + size
+            chunk = self._head[self._pos:end]
+            self._pos += len(chunk)
+            return bytes(chunk)
+        return self._stream.read(size)
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    A ttl or maxsize of 0 disables caching entirely.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable):
+        """Return the cached value for key, or None if missing or expired."""
+        hit = self.get_with_time(key)
+        return None if hit is None else hit[0]
+
+    def get_with_time(self, key: Hashable) -> Optional[Tuple[object, float]]:
+        """Return (value, Unix time it was stored) for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, stored_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value, stored_at
+
+    def set(self, key: Hashable, value) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _run_in_thread(fn, *args) -> Future:
+    """Run fn(*args) on a new daemon thread and return a Future for its outcome."""
+    future: Future = Future()
+
+    def _target():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_target, name="bgpq4-ipv4", daemon=True).start()
+    return future
 
 
 class BGPQ4ClientError(Exception):
@@ -68,6 +199,154 @@ class BGPQ4NotFoundError(BGPQ4ClientError):
     pass
 
 
+# Starts by printing its PID (its process group too, under setsid), then runs
+# bgpq4 once per line of shell-quoted arguments read from stdin. Each reply
+# is bgpq4's stdout, then a sentinel line with the exit code and the stderr
+# length, then the stderr bytes.
+_HELPER_SENTINEL = b"__IRR_BGPQ4_END__"
+_HELPER_SCRIPT = (
+    'echo "$$"\n'
+    'bin="$1"; err=$(mktemp) || exit 1; trap \'rm -f "$err"\' EXIT\n'
+    'while IFS= read -r line; do\n'
+    '  eval "set -- $line"\n'
+    '  "$bin" "$@" </dev/null 2>"$err"; rc=$?\n'
+    f'  printf \'\\n%s %s %s\\n\' {_HELPER_SENTINEL.decode()} "$rc" "$(wc -c < "$err")"\n'
+    '  cat "$err"\n'
+    'done\n'
+)
+
+
+class _BGPQ4Helper:
+    """Long-lived shell that runs bgpq4 for each query written to its stdin.
+
+    Used in persistent mode so the WSL (or shell) startup cost is paid once
+    per helper instead of once per query. Queries are serialized on a lock;
+    a helper that times out or dies is killed and respawned on next use.
+
+    Killing reaches the helper's whole process group, so a hung bgpq4 goes
+    with it. Natively the shell leads a new session; through WSL it runs
+    under setsid on the Linux side, and the group is killed from there,
+    since ending wsl.exe alone would leave the Linux processes running.
+    """
+
+    def __init__(self, bgpq4_cmd: List[str], timeout: int):
+        self.bgpq4_cmd = bgpq4_cmd
+        self.timeout = timeout
+        *prefix, _ = bgpq4_cmd
+        # Prefix for running Linux commands inside WSL, or None natively;
+        # --exec skips WSL's login shell re-parsing the script.
+        self._wsl = prefix + ["--exec"] if prefix and prefix[0] == "wsl" else None
+        self._proc: Optional[subprocess.Popen] = None
+        self._pgid: Optional[int] = None  # the helper's Linux-side process group
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen:
+        *prefix, binary = self.bgpq4_cmd
+        if self._wsl is not None:
+            # A new Linux-side process group to kill on timeout; --wait keeps
+            # wsl.exe attached for the helper's whole life.
+            prefix = self._wsl + ["setsid", "--wait"]
+        cmd = prefix + ["sh", "-c", _HELPER_SCRIPT, "irr-bgpq4", binary]
+        try:
+            return subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                # Own process group, so a kill also reaches a hung bgpq4 child
+                # that would otherwise keep stdout open.
+                start_new_session=os.name == "posix",
+            )
+        except FileNotFoundError:
+            raise BGPQ4NotFoundError(
+                f"Command not found: {cmd[0]}. "
+                f"Ensure bgpq4 is installed (WSL: sudo apt install bgpq4)"
+            )
+
+    def run(self, args: List[str]) -> Tuple[int, bytes, bytes]:
+        """Run one bgpq4 query.
+
+        Returns:
+            Tuple of (exit code, stdout, stderr).
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = self._spawn()
+                self._pgid = None
+            proc = self._proc
+
+            timed_out = threading.Event()
+
+            def _kill():
+                timed_out.set()
+                self._kill(proc)
+
+            watchdog = threading.Timer(self.timeout, _kill)
+            watchdog.start()
+            chunks: List[bytes] = []
+            line = b""
+            try:
+                if self._pgid is None:
+                    self._pgid = int(proc.stdout.readline())
+                proc.stdin.write(shlex.join(args).encode() + b"\n")
+                proc.stdin.flush()
+                while True:
+                    line = proc.stdout.readline()
+                    if not line or line.startswith(_HELPER_SENTINEL):
+                        break
+                    chunks.append(line)
+                if line:
+                    _, returncode, stderr_len = line.split()
+                    stderr = proc.stdout.read(int(stderr_len))
+            except (OSError, ValueError):
+                line = b""
+            finally:
+                watchdog.cancel()
+
+            if not line:
+                self._discard()
+                if timed_out.is_set():
+                    raise BGPQ4ClientError(
+                        f"bgpq4 timed out after {self.timeout}s for {args[-1]}"
+                    )
+                raise BGPQ4ClientError("bgpq4 helper process exited unexpectedly")
+
+            return int(returncode), b"".join(chunks), stderr
+
+    def _kill(self, proc: subprocess.Popen) -> None:
+        if os.name == "posix":
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            return
+        if self._wsl is not None and self._pgid is not None:
+            try:
+                subprocess.run(
+                    self._wsl + ["kill", "-KILL", "--", f"-{self._pgid}"],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=30,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        proc.kill()
+
+    def _discard(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        self._kill(proc)
+        proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+
 class BGPQ4Client:
     """Client for querying IRR databases via BGPQ4.
 
@@ -82,6 +361,9 @@ class BGPQ4Client:
         timeout: int = 120,
         sources: List[str] = None,
         aggregate: bool = True,
+        cache_ttl: int = 300,
+        cache_size: int = 1024,
+        persistent: bool = False,
     ):
         """Initialize the BGPQ4 client.
 
@@ -92,6 +374,13 @@ class BGPQ4Client:
             sources: IRR sources for -S flag (e.g., ["RADB", "RPKI"]).
                      bgpq4 accepts comma-separated sources: -S RADB,RPKI.
             aggregate: Whether to use -A flag for prefix aggregation.
+            cache_ttl: Seconds to keep raw bgpq4 results in memory (0 disables).
+            cache_size: Maximum number of (target, family) results to cache.
+            persistent: Run queries through two long-lived helper shells (one
+                        per address family) instead of starting bgpq4 afresh
+                        each time. Mainly useful with WSL, whose startup cost
+                        dominates short queries. Each helper runs one query
+                        at a time, so concurrent fetches take turns on it.
         """
         if bgpq4_cmd is not None:
             self.bgpq4_cmd = bgpq4_cmd
@@ -107,34 +396,49 @@ class BGPQ4Client:
         else:
             self.sources = sources
         self.aggregate = aggregate
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._helpers = (
+            {ipv6: _BGPQ4Helper(self.bgpq4_cmd, timeout) for ipv6 in (False, True)}
+            if persistent else None
+        )
 
-    def fetch_prefixes(self, target: str) -> PrefixResult:
+    def fetch_prefixes(self, target: str, use_cache: bool = True) -> PrefixResult:
         """Fetch IPv4 and IPv6 prefixes for a target ASN or AS-SET.
 
         Args:
             target: ASN (e.g., "AS15169") or AS-SET (e.g., "AS-GOOGLE").
+            use_cache: If False, always run bgpq4; the fresh result still
+                replaces the cached one.
 
         Returns:
-            PrefixResult with aggregated prefixes.
+            PrefixResult with aggregated prefixes. fetched_at is taken once
+            both families are in, so it is never earlier than either fetch.
         """
         target = target.strip().upper()
         result = PrefixResult(sources_queried=list(self.sources))
 
+        # IPv4 and IPv6 lookups are independent subprocesses; run IPv4 on a
+        # thread of its own while this thread runs IPv6. The thread is per
+        # call, so concurrent callers never queue behind each other here.
+        v4_future = _run_in_thread(self._query_family, target, False, use_cache)
+        try:
+            v6 = self._query_family(target, True, use_cache)
+        except BGPQ4ClientError as e:
+            v6 = e
+
         # Fetch IPv4
         try:
-            v4_raw = self._run_bgpq4(target, ipv6=False)
-            result.ipv4_raw_count = len(v4_raw)
-            result.ipv4_prefixes = collapse_prefixes(v4_raw)
+            result.ipv4_raw_count, v4_prefixes = v4_future.result()
+            result.ipv4_prefixes = v4_prefixes
         except BGPQ4ClientError as e:
             result.errors.append(f"IPv4 query failed: {e}")
 
         # Fetch IPv6
-        try:
-            v6_raw = self._run_bgpq4(target, ipv6=True)
-            result.ipv6_raw_count = len(v6_raw)
-            result.ipv6_prefixes = collapse_prefixes(v6_raw)
-        except BGPQ4ClientError as e:
-            result.errors.append(f"IPv6 query failed: {e}")
+        if isinstance(v6, BGPQ4ClientError):
+            result.errors.append(f"IPv6 query failed: {v6}")
+        else:
+            result.ipv6_raw_count, result.ipv6_prefixes = v6
+        result.fetched_at = time.time()
 
         logger.info(
             f"BGPQ4 fetched for {target}: "
@@ -152,6 +456,57 @@ class BGPQ4Client:
 
         return result
 
+    def cached_prefixes(self, target: str) -> Optional[PrefixResult]:
+        """Return the result for target if both families are cached, else None.
+
+        Only touches the in-memory cache, so it is cheap enough to call from
+        an event loop before deciding whether a worker thread is needed. The
+        prefix fields are the cached tuples themselves, not copies, so callers
+        can tell by identity whether the cache entry has been replaced.
+        fetched_at is when the newer of the two entries was cached.
+        """
+        target = target.strip().upper()
+        v4_hit = self._cache.get_with_time((target, False))
+        v6_hit = self._cache.get_with_time((target, True))
+        if v4_hit is None or v6_hit is None:
+            return None
+        (v4, v4_at), (v6, v6_at) = v4_hit, v6_hit
+        return PrefixResult(
+            ipv4_prefixes=v4[1],
+            ipv6_prefixes=v6[1],
+            ipv4_raw_count=v4[0],
+            ipv6_raw_count=v6[0],
+            sources_queried=list(self.sources),
+            fetched_at=max(v4_at, v6_at),
+        )
+
+    def _query_family(
+        self, target: str, ipv6: bool, use_cache: bool = True
+    ) -> Tuple[int, Tuple[str, ...]]:
+        """Fetch and aggregate one address family, serving repeats from the TTL cache.
+
+        Sources and aggregation are fixed per client, so the cache key is
+        just (target, ipv6). The cached value is already aggregated and
+        sorted, so a hit skips the subprocess, the collapse and the sort.
+        Failures are never cached.
+
+        Prefix strings are interned, so a prefix cached under several
+        targets (an AS-SET and its member ASNs) is held in memory once.
+
+        Returns:
+            Tuple of (raw prefix count, aggregated prefixes in numeric order).
+        """
+        key = (target, ipv6)
+        cached = self._cache.get(key) if use_cache else None
+        if cached is not None:
+            logger.debug(f"bgpq4 cache hit for {target} ({'IPv6' if ipv6 else 'IPv4'})")
+            return cached
+
+        raw = self._run_bgpq4(target, ipv6)
+        entry = (len(raw), tuple(sys.intern(str(n)) for n in _collapse_networks(raw)))
+        self._cache.set(key, entry)
+        return entry
+
     def _run_bgpq4(self, target: str, ipv6: bool = False) -> Set[str]:
         """Run bgpq4 and parse JSON output.
 
@@ -162,25 +517,30 @@ class BGPQ4Client:
         Returns:
             Set of prefix strings.
         """
-        cmd = list(self.bgpq4_cmd)
-        cmd.append("-6" if ipv6 else "-4")
-        cmd.append("-j")  # JSON output
-        cmd.extend(["-S", ",".join(self.sources)])
-        cmd.extend(["-l", "pl"])
-        cmd.append(target)
-
+        args = ["-6" if ipv6 else "-4"]
+        args.append("-j")  # JSON output
+        args.extend(["-S", ",".join(self.sources)])
+        args.extend(["-l", "pl"])
+        args.append(target)
+
+        if self._helpers is not None:
+            logger.debug(f"Running via helper: {' '.join(args)}")
+            returncode, stdout, stderr = self._helpers[ipv6].run(args)
+            if returncode != 0:
+                raise BGPQ4ClientError(
+                    f"bgpq4 exited with code {returncode}: "
+                    f"{stderr.decode('utf-8', 'replace').strip()}"
+                )
+            return self._parse_json_output(stdout)
+
+        cmd = self.bgpq4_cmd + args
         logger.debug(f"Running: {' '.join(cmd)}")
 
         try:
-            proc = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-            )
-        except subprocess.TimeoutExpired:
-            raise BGPQ4ClientError(
-                f"bgpq4 timed out after {self.timeout}s for {target}"
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
             )
         except FileNotFoundError:
             raise BGPQ4NotFoundError(
@@ -188,15 +548,82 @@ class BGPQ4Client:
                 f"Ensure bgpq4 is installed (WSL: sudo apt install bgpq4)"
             )
 
-        if proc.returncode != 0:
-            stderr = proc.stderr.strip()
+        # Drain stderr on a helper thread so a chatty bgpq4 cannot fill the
+        # pipe buffer and block while stdout is still being consumed.
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()),
+            daemon=True,
+        )
+        stderr_reader.start()
+
+        timed_out = threading.Event()
+
+        def _kill():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(self.timeout, _kill)
+        watchdog.start()
+        parse_error = None
+        try:
+            try:
+                prefixes = self._parse_json_stream(proc.stdout)
+            except BGPQ4ClientError as e:
+                prefixes, parse_error = set(), e
+                # Discard the rest so bgpq4 can run to completion and report
+                # its own exit status.
+                while proc.stdout.read(65536):
+                    pass
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            stderr_reader.join()
+            proc.stdout.close()
+            proc.stderr.close()
+
+        if timed_out.is_set():
+            raise BGPQ4ClientError(
+                f"bgpq4 timed out after {self.timeout}s for {target}"
+            )
+
+        if returncode != 0:
+            stderr = b"".join(stderr_chunks).decode("utf-8", "replace").strip()
             raise BGPQ4ClientError(
-                f"bgpq4 exited with code {proc.returncode}: {stderr}"
+                f"bgpq4 exited with code {returncode}: {stderr}"
             )
 
-        return self._parse_json_output(proc.stdout)
+        if parse_error is not None:
+            raise parse_error
+
+        return prefixes
+
+    def _parse_json_stream(self, stream: BinaryIO) -> Set[str]:
+        """Collect prefixes from bgpq4's stdout pipe.
+
+        Typical output, up to _STREAM_PARSE_THRESHOLD bytes, is read whole
+        and handed to _parse_json_output(), where one orjson pass beats
+        streaming by several times. Larger output is decoded one entry at a
+        time with ijson, so peak memory follows the prefix set instead of
+        the raw output plus a parsed document. Without ijson, everything
+        takes the one-pass route.
+        """
+        if ijson is None:
+            return self._parse_json_output(stream.read())
+
+        head = stream.read(_STREAM_PARSE_THRESHOLD)
+        if len(head) < _STREAM_PARSE_THRESHOLD:
+            return self._parse_json_output(head)
+
+        try:
+            return {
+                p for entry in ijson.items(_PrefixedReader(head, stream), "pl.item")
+                if (p := entry.get("prefix"))
+            }
+        except ijson.JSONError as e:
+            raise BGPQ4ClientError(f"Failed to parse bgpq4 JSON output: {e}")
 
-    def _parse_json_output(self, output: str) -> Set[str]:
+    def _parse_json_output(self, output: Union[bytes, str]) -> Set[str]:
         """Parse BGPQ4 JSON output to extract prefixes.
 
         BGPQ4 -j output format:
@@ -209,21 +636,18 @@ class BGPQ4Client:
             return set()
 
         try:
-            data = json.loads(output)
-        except json.JSONDecodeError as e:
+            data = _json_loads(output)
+        except ValueError as e:  # json and orjson decode errors both subclass it
             raise BGPQ4ClientError(f"Failed to parse bgpq4 JSON output: {e}")
 
-        prefixes = set()
-        for entry in data.get("pl", []):
-            prefix = entry.get("prefix")
-            if prefix:
-                prefixes.add(prefix)
-
-        return prefixes
+        return {p for entry in data.get("pl", ()) if (p := entry.get("prefix"))}
 
     def close(self):
-        """No-op for API compatibility (no persistent connections)."""
-        pass
+        """Drop cached results and shut down the helpers."""
+        self._cache.clear()
+        if self._helpers is not None:
+            for helper in self._helpers.values():
+                helper.close()
 
     def __enter__(self):
         return self
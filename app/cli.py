@@ -1,26 +1,66 @@
 """CLI entry point for IRR Automation."""
 
 import argparse
+import importlib
 import json
 import re
+import queue
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Set
 
-from app.config import load_config, Config
+from app.config import load_config_cached, Config
 from app.logger import setup_logging, get_logger
-from app.store import SnapshotStore
-from app.bgpq4_client import BGPQ4Client
-from app.api_proxy_client import APIProxyClient
-from app.diff import compute_diff, format_diff_human, format_diff_json, DiffResult
-from app.ticketing import TicketingClient
-from app.teams import TeamsNotifier
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+_ASN_RE = re.compile(r'^AS\d+$')
+
+# Command dependencies pull in sqlite3, requests and friends, so they are
+# imported on first use rather than at startup; `--help` and argument errors
+# never touch them. They still resolve as module attributes (app.cli.SnapshotStore).
+_LAZY_IMPORTS = {
+    'SnapshotStore': 'app.store',
+    'BGPQ4Client': 'app.bgpq4_client',
+    'APIProxyClient': 'app.api_proxy_client',
+    'compute_diff': 'app.diff',
+    'format_diff_human': 'app.diff',
+    'format_diff_json': 'app.diff',
+    'DiffResult': 'app.diff',
+    'TicketingClient': 'app.ticketing',
+    'TeamsNotifier': 'app.teams',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _import_command_deps() -> None:
+    """Bind any not-yet-imported command dependencies as module globals."""
+    for name in _LAZY_IMPORTS:
+        if name not in globals():
+            __getattr__(name)
+
+
+def _intern_target(target: str) -> str:
+    """Upper-case a target and intern it, so repeated targets share one string."""
+    return sys.intern(target.upper())
 
 
 def detect_target_type(target: str) -> str:
     """Detect whether a target is an ASN or AS-SET."""
-    if re.match(r'^AS\d+$', target):
+    if _ASN_RE.match(target):
         return 'asn'
     return 'as-set'
 
@@ -31,6 +71,7 @@ def create_irr_client(config: Config):
     Returns APIProxyClient when api_url is set (proxy mode),
     otherwise returns BGPQ4Client (direct mode via WSL).
     """
+    _import_command_deps()
     if config.api_url:
         return APIProxyClient(
             api_url=config.api_url,
@@ -44,9 +85,55 @@ def create_irr_client(config: Config):
     )
 
 
+# Database files already migrated by this process (run-all and repeated
+# handler calls only need the schema check once).
+_MIGRATED_PATHS: Set[str] = set()
+
+
+def _ensure_schema(store: 'SnapshotStore') -> None:
+    """Migrate the store's database unless this process already has.
+
+    ':memory:' databases are private to each connection, so they are
+    always migrated.
+    """
+    if store.db_path == ':memory:' or store.db_path not in _MIGRATED_PATHS:
+        store.migrate()
+        if store.db_path != ':memory:':
+            _MIGRATED_PATHS.add(store.db_path)
+
+
+def _dumps(obj) -> str:
+    """Encode JSON output compactly, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _ts_iso(t: int) -> str:
+    """Format a unix timestamp as local-time ISO 8601, like datetime.isoformat()."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t))
+
+
+def _ts_human(t: int) -> str:
+    """Format a unix timestamp as local 'YYYY-MM-DD HH:MM:SS'."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+
+# (unix second, formatted string) of the last timestamp produced.
+_last_timestamp = (-1, "")
+
+
 def get_timestamp_str() -> str:
-    """Get current timestamp as formatted string."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Get current timestamp as formatted string.
+
+    The string only changes once a second, so it is reformatted only when
+    the second ticks over; time.strftime also avoids building a datetime.
+    """
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, _ts_human(now))
+    return _last_timestamp[1]
 
 
 def print_output(message: str, json_mode: bool = False, quiet: bool = False):
@@ -58,8 +145,112 @@ def print_output(message: str, json_mode: bool = False, quiet: bool = False):
             print(f"[{get_timestamp_str()}] {message}")
 
 
+class _LazySubparser(argparse.ArgumentParser):
+    """Subcommand parser whose arguments are added the first time it is used.
+
+    Only the chosen subcommand's parser ever parses or prints help, so the
+    others never pay for their add_argument calls.
+    """
+
+    def __init__(self, *args, builder=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._builder = builder
+
+    def _ensure_built(self) -> None:
+        if self._builder is not None:
+            builder, self._builder = self._builder, None
+            builder(self)
+
+    def parse_known_args(self, *args, **kwargs):
+        # Build before argparse applies the actions' defaults to the namespace,
+        # which it does here, ahead of the internal _parse_known_args().
+        self._ensure_built()
+        return super().parse_known_args(*args, **kwargs)
+
+    def format_usage(self):
+        self._ensure_built()
+        return super().format_usage()
+
+    def format_help(self):
+        self._ensure_built()
+        return super().format_help()
+
+
+def _add_target_argument(parser: argparse.ArgumentParser, action: str) -> None:
+    parser.add_argument(
+        '--target', '-t',
+        required=True,
+        help=f'ASN or AS-SET to {action} (e.g., AS15169, AS-GOOGLE)'
+    )
+
+
+def _add_dry_run_argument(parser: argparse.ArgumentParser, what: str = 'the ticket') -> None:
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help=f'Do not actually create {what}'
+    )
+
+
+def _build_init_db_parser(parser: argparse.ArgumentParser) -> None:
+    pass
+
+
+def _build_fetch_parser(parser: argparse.ArgumentParser) -> None:
+    _add_target_argument(parser, 'fetch')
+
+
+def _build_diff_parser(parser: argparse.ArgumentParser) -> None:
+    _add_target_argument(parser, 'diff')
+
+
+def _build_submit_parser(parser: argparse.ArgumentParser) -> None:
+    _add_target_argument(parser, 'submit ticket for')
+    _add_dry_run_argument(parser)
+
+
+def _build_run_parser(parser: argparse.ArgumentParser) -> None:
+    _add_target_argument(parser, 'process')
+    _add_dry_run_argument(parser)
+
+
+def _build_run_all_parser(parser: argparse.ArgumentParser) -> None:
+    _add_dry_run_argument(parser, 'tickets')
+
+
+def _build_history_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--target', '-t',
+        required=False,
+        default=None,
+        help='ASN or AS-SET to show history for (e.g., AS15169, AS-GOOGLE). Omit to show all targets.'
+    )
+    parser.add_argument(
+        '--limit', '-l',
+        type=int,
+        default=10,
+        help='Maximum number of snapshots to show (default: 10)'
+    )
+
+
+# Subcommand name -> (help text, builder that adds its arguments)
+SUBCOMMAND_BUILDERS = {
+    'init-db': ('Initialize the database', _build_init_db_parser),
+    'fetch': ('Fetch prefixes and store snapshot', _build_fetch_parser),
+    'diff': ('Compute diff against previous snapshot', _build_diff_parser),
+    'submit': ('Submit ticket for detected changes', _build_submit_parser),
+    'run': ('Fetch, diff, and submit ticket if changes detected', _build_run_parser),
+    'run-all': ('Run for all configured targets', _build_run_all_parser),
+    'history': ('Show snapshot history', _build_history_parser),
+}
+
+
 def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser with all subcommands."""
+    """Create the argument parser with all subcommands.
+
+    Subcommand arguments are only added once that subcommand is selected
+    (see _LazySubparser).
+    """
     parser = argparse.ArgumentParser(
         prog='irr-cli',
         description='IRR Prefix Change Detection & Ticket Automation'
@@ -87,102 +278,20 @@ def create_parser() -> argparse.ArgumentParser:
         help='Output results as JSON'
     )
 
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-
-    # init-db command
-    init_parser = subparsers.add_parser(
-        'init-db',
-        help='Initialize the database'
-    )
-
-    # fetch command
-    fetch_parser = subparsers.add_parser(
-        'fetch',
-        help='Fetch prefixes and store snapshot'
-    )
-    fetch_parser.add_argument(
-        '--target', '-t',
-        required=True,
-        help='ASN or AS-SET to fetch (e.g., AS15169, AS-GOOGLE)'
-    )
-
-    # diff command
-    diff_parser = subparsers.add_parser(
-        'diff',
-        help='Compute diff against previous snapshot'
-    )
-    diff_parser.add_argument(
-        '--target', '-t',
-        required=True,
-        help='ASN or AS-SET to diff (e.g., AS15169, AS-GOOGLE)'
-    )
-
-    # submit command
-    submit_parser = subparsers.add_parser(
-        'submit',
-        help='Submit ticket for detected changes'
-    )
-    submit_parser.add_argument(
-        '--target', '-t',
-        required=True,
-        help='ASN or AS-SET to submit ticket for (e.g., AS15169, AS-GOOGLE)'
-    )
-    submit_parser.add_argument(
-        '--dry-run',
-        action='store_true',
-        help='Do not actually create the ticket'
-    )
-
-    # run command (all-in-one)
-    run_parser = subparsers.add_parser(
-        'run',
-        help='Fetch, diff, and submit ticket if changes detected'
-    )
-    run_parser.add_argument(
-        '--target', '-t',
-        required=True,
-        help='ASN or AS-SET to process (e.g., AS15169, AS-GOOGLE)'
-    )
-    run_parser.add_argument(
-        '--dry-run',
-        action='store_true',
-        help='Do not actually create the ticket'
-    )
-
-    # run-all command
-    run_all_parser = subparsers.add_parser(
-        'run-all',
-        help='Run for all configured targets'
-    )
-    run_all_parser.add_argument(
-        '--dry-run',
-        action='store_true',
-        help='Do not actually create tickets'
-    )
-
-    # history command
-    history_parser = subparsers.add_parser(
-        'history',
-        help='Show snapshot history'
-    )
-    history_parser.add_argument(
-        '--target', '-t',
-        required=False,
-        default=None,
-        help='ASN or AS-SET to show history for (e.g., AS15169, AS-GOOGLE). Omit to show all targets.'
-    )
-    history_parser.add_argument(
-        '--limit', '-l',
-        type=int,
-        default=10,
-        help='Maximum number of snapshots to show (default: 10)'
+    subparsers = parser.add_subparsers(
+        dest='command',
+        help='Available commands',
+        parser_class=_LazySubparser,
     )
+    for name, (help_text, builder) in SUBCOMMAND_BUILDERS.items():
+        subparsers.add_parser(name, help=help_text, builder=builder)
 
     return parser
 
 
 def cmd_init_db(config: Config, args: argparse.Namespace) -> int:
     """Initialize the database."""
+    _import_command_deps()
     logger = get_logger('cli')
 
     print_output("Initializing database...", args.json, args.quiet)
@@ -194,7 +303,7 @@ def cmd_init_db(config: Config, args: argparse.Namespace) -> int:
     print_output(f"Database initialized at {config.database.path}", args.json, args.quiet)
 
     if args.json:
-        print(json.dumps({
+        print(_dumps({
             'status': 'success',
             'database_path': config.database.path,
         }))
@@ -204,8 +313,9 @@ def cmd_init_db(config: Config, args: argparse.Namespace) -> int:
 
 def cmd_fetch(config: Config, args: argparse.Namespace) -> int:
     """Fetch prefixes and store snapshot."""
+    _import_command_deps()
     logger = get_logger('cli')
-    target = args.target.upper()
+    target = _intern_target(args.target)
 
     print_output(f"Fetching prefixes for {target}...", args.json, args.quiet)
 
@@ -224,16 +334,15 @@ def cmd_fetch(config: Config, args: argparse.Namespace) -> int:
     # Store snapshot
     store = SnapshotStore(config.database.path)
     try:
-        store.migrate()
-        snapshot_id = store.save_snapshot(
+        _ensure_schema(store)
+        snapshot = store.create_snapshot(
             target=target,
             target_type=detect_target_type(target),
             irr_sources=result.sources_queried,
-            ipv4_prefixes=list(result.ipv4_prefixes),
-            ipv6_prefixes=list(result.ipv6_prefixes),
+            ipv4_prefixes=result.ipv4_prefixes,
+            ipv6_prefixes=result.ipv6_prefixes,
         )
-
-        snapshot = store.get_snapshot_by_id(snapshot_id)
+        snapshot_id = snapshot.id
     finally:
         store.close()
 
@@ -245,7 +354,7 @@ def cmd_fetch(config: Config, args: argparse.Namespace) -> int:
     print_output(f"Snapshot saved (id: {snapshot_id}, hash: {snapshot.content_hash[:12]}...)", args.json, args.quiet)
 
     if args.json:
-        print(json.dumps({
+        print(_dumps({
             'target': target,
             'snapshot': {
                 'id': snapshot_id,
@@ -264,11 +373,12 @@ def cmd_fetch(config: Config, args: argparse.Namespace) -> int:
 
 def cmd_diff(config: Config, args: argparse.Namespace) -> int:
     """Compute diff against previous snapshot."""
+    _import_command_deps()
     logger = get_logger('cli')
-    target = args.target.upper()
+    target = _intern_target(args.target)
 
     store = SnapshotStore(config.database.path)
-    store.migrate()
+    _ensure_schema(store)
 
     try:
         # Get latest snapshot
@@ -290,10 +400,10 @@ def cmd_diff(config: Config, args: argparse.Namespace) -> int:
         store.close()
 
     if args.json:
-        print(json.dumps(format_diff_json(diff)))
+        print(_dumps(format_diff_json(diff)))
     else:
         if previous:
-            prev_time = datetime.fromtimestamp(previous.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            prev_time = _ts_human(previous.timestamp)
             print_output(f"Comparing with previous snapshot ({prev_time})", args.json, args.quiet)
         else:
             print_output("No previous snapshot found (first run)", args.json, args.quiet)
@@ -305,12 +415,13 @@ def cmd_diff(config: Config, args: argparse.Namespace) -> int:
 
 def cmd_submit(config: Config, args: argparse.Namespace) -> int:
     """Submit ticket for detected changes."""
+    _import_command_deps()
     logger = get_logger('cli')
-    target = args.target.upper()
+    target = _intern_target(args.target)
     dry_run = args.dry_run
 
     store = SnapshotStore(config.database.path)
-    store.migrate()
+    _ensure_schema(store)
 
     try:
         # Get latest diff
@@ -322,7 +433,7 @@ def cmd_submit(config: Config, args: argparse.Namespace) -> int:
         if not diff_record.has_changes:
             print_output(f"No changes to submit for {target}", args.json, args.quiet)
             if args.json:
-                print(json.dumps({
+                print(_dumps({
                     'target': target,
                     'status': 'no_changes',
                 }))
@@ -336,7 +447,7 @@ def cmd_submit(config: Config, args: argparse.Namespace) -> int:
                 args.json, args.quiet
             )
             if args.json:
-                print(json.dumps({
+                print(_dumps({
                     'target': target,
                     'status': 'already_submitted',
                     'ticket_id': existing_ticket.external_ticket_id,
@@ -407,7 +518,7 @@ def cmd_submit(config: Config, args: argparse.Namespace) -> int:
             print_output(f"ERROR: Failed to create ticket: {response.error_message}", args.json, args.quiet)
 
         if args.json:
-            print(json.dumps({
+            print(_dumps({
                 'target': target,
                 'status': response.status,
                 'ticket_id': response.ticket_id,
@@ -422,10 +533,45 @@ def cmd_submit(config: Config, args: argparse.Namespace) -> int:
         store.close()
 
 
-def cmd_run(config: Config, args: argparse.Namespace) -> int:
-    """All-in-one: fetch, diff, and submit if changes detected."""
+def cmd_run(
+    config: Config,
+    args: argparse.Namespace,
+    client=None,
+    store: Optional['SnapshotStore'] = None,
+    ticket_client: Optional['TicketingClient'] = None,
+) -> int:
+    """All-in-one: fetch, diff, and submit if changes detected.
+
+    run-all passes in an IRR client, an already-migrated store and a ticketing
+    client shared across its targets. Any that are not passed are created
+    here and closed before returning.
+    """
+    _import_command_deps()
+    owned = []
+    if client is None:
+        client = create_irr_client(config)
+        owned.append(client)
+    if store is None:
+        store = SnapshotStore(config.database.path)
+        owned.append(store)
+        _ensure_schema(store)
+    try:
+        return _run_one(config, args, client, store, ticket_client)
+    finally:
+        for resource in owned:
+            resource.close()
+
+
+def _run_one(
+    config: Config,
+    args: argparse.Namespace,
+    client,
+    store: 'SnapshotStore',
+    ticket_client: Optional['TicketingClient'],
+) -> int:
+    """Run fetch, diff and ticketing for args.target using the given clients."""
     logger = get_logger('cli')
-    target = args.target.upper()
+    target = _intern_target(args.target)
     dry_run = args.dry_run
 
     print_output(f"Processing {target}...", args.json, args.quiet)
@@ -433,12 +579,7 @@ def cmd_run(config: Config, args: argparse.Namespace) -> int:
     # Step 1: Fetch
     print_output(f"Fetching prefixes for {target}...", args.json, args.quiet)
 
-    client = create_irr_client(config)
-
-    try:
-        fetch_result = client.fetch_prefixes(target)
-    finally:
-        client.close()
+    fetch_result = client.fetch_prefixes(target)
 
     if fetch_result.errors and not fetch_result.ipv4_prefixes and not fetch_result.ipv6_prefixes:
         print_output(f"ERROR: Failed to fetch prefixes: {fetch_result.errors}", args.json, args.quiet)
@@ -451,178 +592,190 @@ def cmd_run(config: Config, args: argparse.Namespace) -> int:
     )
 
     # Step 2: Store snapshot
-    store = SnapshotStore(config.database.path)
-    try:
-        store.migrate()
-        # Get previous snapshot before saving new one
-        # Find the most recent snapshot that is older than (now - lookback)
-        lookback_seconds = config.diff.lookback_hours * 3600
-        current_time = int(time.time())
-        cutoff_time = current_time - lookback_seconds
-        previous = store.get_snapshot_before(target, cutoff_time)
-
-        # Save new snapshot
-        snapshot_id = store.save_snapshot(
-            target=target,
-            target_type=detect_target_type(target),
-            irr_sources=fetch_result.sources_queried,
-            ipv4_prefixes=list(fetch_result.ipv4_prefixes),
-            ipv6_prefixes=list(fetch_result.ipv6_prefixes),
-        )
-        snapshot = store.get_snapshot_by_id(snapshot_id)
-
-        print_output(f"Snapshot saved (hash: {snapshot.content_hash[:12]}...)", args.json, args.quiet)
+    # Get previous snapshot before saving new one
+    # Find the most recent snapshot that is older than (now - lookback)
+    lookback_seconds = config.diff.lookback_hours * 3600
+    current_time = int(time.time())
+    cutoff_time = current_time - lookback_seconds
+    previous = store.get_snapshot_before(target, cutoff_time)
+
+    # Save new snapshot
+    snapshot = store.create_snapshot(
+        target=target,
+        target_type=detect_target_type(target),
+        irr_sources=fetch_result.sources_queried,
+        ipv4_prefixes=fetch_result.ipv4_prefixes,
+        ipv6_prefixes=fetch_result.ipv6_prefixes,
+    )
+    snapshot_id = snapshot.id
 
-        # Step 3: Compute diff
-        diff = compute_diff(snapshot, previous)
+    print_output(f"Snapshot saved (hash: {snapshot.content_hash[:12]}...)", args.json, args.quiet)
 
-        if previous:
-            prev_time = datetime.fromtimestamp(previous.timestamp).strftime("%Y-%m-%d %H:%M:%S")
-            print_output(f"Comparing with previous snapshot ({prev_time})", args.json, args.quiet)
-        else:
-            print_output("No previous snapshot found (first run)", args.json, args.quiet)
+    # Step 3: Compute diff
+    diff = compute_diff(snapshot, previous)
 
-        # Store diff
-        diff_id = store.save_diff(
-            new_snapshot_id=snapshot_id,
-            old_snapshot_id=previous.id if previous else None,
-            target=target,
-            added_v4=diff.added_v4,
-            removed_v4=diff.removed_v4,
-            added_v6=diff.added_v6,
-            removed_v6=diff.removed_v6,
-            diff_hash=diff.diff_hash,
-        )
+    if previous:
+        prev_time = _ts_human(previous.timestamp)
+        print_output(f"Comparing with previous snapshot ({prev_time})", args.json, args.quiet)
+    else:
+        print_output("No previous snapshot found (first run)", args.json, args.quiet)
+
+    # Store diff
+    diff_id = store.save_diff(
+        new_snapshot_id=snapshot_id,
+        old_snapshot_id=previous.id if previous else None,
+        target=target,
+        added_v4=diff.added_v4,
+        removed_v4=diff.removed_v4,
+        added_v6=diff.added_v6,
+        removed_v6=diff.removed_v6,
+        diff_hash=diff.diff_hash,
+    )
 
-        # Print diff summary
-        if not args.json and not args.quiet:
-            print("Changes detected:" if diff.has_changes else "No changes detected")
-            if diff.added_v4:
-                print(f"  - Added IPv4: {len(diff.added_v4)} prefixes")
-            if diff.removed_v4:
-                print(f"  - Removed IPv4: {len(diff.removed_v4)} prefixes")
-            if diff.added_v6:
-                print(f"  - Added IPv6: {len(diff.added_v6)} prefixes")
-            if diff.removed_v6:
-                print(f"  - Removed IPv6: {len(diff.removed_v6)} prefixes")
-
-        # Step 4: Submit ticket if changes detected and ticketing is configured
-        ticket_response = None
-        if diff.has_changes:
-            if config.ticketing.base_url:
-                ticket_client = TicketingClient(
-                    base_url=config.ticketing.base_url,
-                    api_token=config.ticketing.api_token,
-                    timeout=config.ticketing.timeout_seconds,
-                    max_retries=config.ticketing.max_retries,
+    # Print diff summary
+    if not args.json and not args.quiet:
+        # One write, so the block is not interleaved with other output.
+        lines = ["Changes detected:" if diff.has_changes else "No changes detected"]
+        if diff.added_v4:
+            lines.append(f"  - Added IPv4: {len(diff.added_v4)} prefixes")
+        if diff.removed_v4:
+            lines.append(f"  - Removed IPv4: {len(diff.removed_v4)} prefixes")
+        if diff.added_v6:
+            lines.append(f"  - Added IPv6: {len(diff.added_v6)} prefixes")
+        if diff.removed_v6:
+            lines.append(f"  - Removed IPv6: {len(diff.removed_v6)} prefixes")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    # Step 4: Submit ticket if changes detected and ticketing is configured
+    ticket_response = None
+    if diff.has_changes:
+        if config.ticketing.base_url:
+            own_ticket_client = ticket_client is None
+            if own_ticket_client:
+                ticket_client = _create_ticketing_client(config)
+
+            try:
+                payload = ticket_client.get_payload(target, diff, fetch_result.sources_queried)
+
+                # Save pending ticket
+                ticket_id = store.save_ticket(
+                    diff_id=diff_id,
+                    target=target,
+                    status='pending',
+                    request_payload=payload,
                 )
 
-                try:
-                    payload = ticket_client.get_payload(target, diff, fetch_result.sources_queried)
-
-                    # Save pending ticket
-                    ticket_id = store.save_ticket(
-                        diff_id=diff_id,
-                        target=target,
-                        status='pending',
-                        request_payload=payload,
-                    )
+                # Submit
+                ticket_response = ticket_client.create_ticket(
+                    target, diff, fetch_result.sources_queried, dry_run=dry_run
+                )
 
-                    # Submit
-                    ticket_response = ticket_client.create_ticket(
-                        target, diff, fetch_result.sources_queried, dry_run=dry_run
-                    )
+                # Update ticket status
+                store.update_ticket_status(
+                    ticket_id=ticket_id,
+                    status=ticket_response.status,
+                    response_payload={
+                        'ticket_id': ticket_response.ticket_id,
+                        'error_message': ticket_response.error_message,
+                    },
+                    external_ticket_id=ticket_response.ticket_id,
+                )
 
-                    # Update ticket status
-                    store.update_ticket_status(
-                        ticket_id=ticket_id,
-                        status=ticket_response.status,
-                        response_payload={
-                            'ticket_id': ticket_response.ticket_id,
-                            'error_message': ticket_response.error_message,
-                        },
-                        external_ticket_id=ticket_response.ticket_id,
+                if dry_run:
+                    print_output(f"[DRY-RUN] Would create ticket", args.json, args.quiet)
+                elif ticket_response.status == 'created':
+                    print_output(f"Ticket created: {ticket_response.ticket_id}", args.json, args.quiet)
+                elif ticket_response.status == 'duplicate':
+                    print_output(f"Ticket already exists: {ticket_response.ticket_id}", args.json, args.quiet)
+                else:
+                    print_output(
+                        f"ERROR: Failed to create ticket: {ticket_response.error_message}",
+                        args.json, args.quiet
                     )
 
-                    if dry_run:
-                        print_output(f"[DRY-RUN] Would create ticket", args.json, args.quiet)
-                    elif ticket_response.status == 'created':
-                        print_output(f"Ticket created: {ticket_response.ticket_id}", args.json, args.quiet)
-                    elif ticket_response.status == 'duplicate':
-                        print_output(f"Ticket already exists: {ticket_response.ticket_id}", args.json, args.quiet)
-                    else:
-                        print_output(
-                            f"ERROR: Failed to create ticket: {ticket_response.error_message}",
-                            args.json, args.quiet
-                        )
-
-                finally:
+            finally:
+                if own_ticket_client:
                     ticket_client.close()
-            else:
-                print_output("Ticketing not configured — skipping ticket creation", args.json, args.quiet)
+        else:
+            print_output("Ticketing not configured — skipping ticket creation", args.json, args.quiet)
 
-            # Send Teams alert — fires on any change, independent of ticketing
-            if config.teams.webhook_url:
-                notifier = TeamsNotifier(
-                    webhook_url=config.teams.webhook_url,
-                    timeout=config.teams.timeout_seconds,
-                )
-                alert_sent = notifier.notify(
-                    target=target,
-                    diff=diff,
-                    ticket_id=ticket_response.ticket_id if ticket_response else None,
-                    dry_run=dry_run,
-                    ipv4_raw_count=fetch_result.ipv4_raw_count,
-                    ipv4_aggregated_count=len(fetch_result.ipv4_prefixes),
-                    ipv6_raw_count=fetch_result.ipv6_raw_count,
-                    ipv6_aggregated_count=len(fetch_result.ipv6_prefixes),
-                )
-                if not alert_sent and not dry_run:
-                    logger.error(f"Teams alert FAILED for {target}")
-                    print_output(
-                        f"WARNING: Teams alert failed for {target} — check webhook URL and connectivity",
-                        args.json, args.quiet,
-                    )
-            else:
-                logger.warning("Teams webhook URL not configured — skipping alert")
+        # Send Teams alert — fires on any change, independent of ticketing
+        if config.teams.webhook_url:
+            notifier = TeamsNotifier(
+                webhook_url=config.teams.webhook_url,
+                timeout=config.teams.timeout_seconds,
+            )
+            alert_sent = notifier.notify(
+                target=target,
+                diff=diff,
+                ticket_id=ticket_response.ticket_id if ticket_response else None,
+                dry_run=dry_run,
+                ipv4_raw_count=fetch_result.ipv4_raw_count,
+                ipv4_aggregated_count=len(fetch_result.ipv4_prefixes),
+                ipv6_raw_count=fetch_result.ipv6_raw_count,
+                ipv6_aggregated_count=len(fetch_result.ipv6_prefixes),
+            )
+            if not alert_sent and not dry_run:
+                logger.error(f"Teams alert FAILED for {target}")
                 print_output(
-                    "WARNING: Teams webhook URL not configured — set TEAMS_WEBHOOK_URL env var",
+                    f"WARNING: Teams alert failed for {target} — check webhook URL and connectivity",
                     args.json, args.quiet,
                 )
+        else:
+            logger.warning("Teams webhook URL not configured — skipping alert")
+            print_output(
+                "WARNING: Teams webhook URL not configured — set TEAMS_WEBHOOK_URL env var",
+                args.json, args.quiet,
+            )
 
-        # JSON output
-        if args.json:
-            output = {
-                'target': target,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'snapshot': {
-                    'id': snapshot_id,
-                    'ipv4_raw_count': fetch_result.ipv4_raw_count,
-                    'ipv4_count': len(fetch_result.ipv4_prefixes),
-                    'ipv6_raw_count': fetch_result.ipv6_raw_count,
-                    'ipv6_count': len(fetch_result.ipv6_prefixes),
-                    'hash': snapshot.content_hash,
-                },
-                'diff': format_diff_json(diff),
+    # JSON output
+    if args.json:
+        output = {
+            'target': target,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'snapshot': {
+                'id': snapshot_id,
+                'ipv4_raw_count': fetch_result.ipv4_raw_count,
+                'ipv4_count': len(fetch_result.ipv4_prefixes),
+                'ipv6_raw_count': fetch_result.ipv6_raw_count,
+                'ipv6_count': len(fetch_result.ipv6_prefixes),
+                'hash': snapshot.content_hash,
+            },
+            'diff': format_diff_json(diff),
+        }
+
+        if ticket_response:
+            output['ticket'] = {
+                'id': ticket_response.ticket_id,
+                'status': ticket_response.status,
+                'dry_run': dry_run,
             }
 
-            if ticket_response:
-                output['ticket'] = {
-                    'id': ticket_response.ticket_id,
-                    'status': ticket_response.status,
-                    'dry_run': dry_run,
-                }
+        print(_dumps(output))
 
-            print(json.dumps(output))
+    return 0
 
-        return 0
 
-    finally:
-        store.close()
+def _create_ticketing_client(config: Config) -> 'TicketingClient':
+    return TicketingClient(
+        base_url=config.ticketing.base_url,
+        api_token=config.ticketing.api_token,
+        timeout=config.ticketing.timeout_seconds,
+        max_retries=config.ticketing.max_retries,
+    )
 
 
 def cmd_run_all(config: Config, args: argparse.Namespace) -> int:
-    """Run for all configured targets."""
+    """Run for all configured targets.
+
+    Targets run concurrently on up to config.concurrency worker threads.
+    Each worker checks out its own IRR client, store and ticketing client,
+    so no SQLite connection or requests session (APIProxyClient and
+    TicketingClient each wrap one) is used by two threads at once. An
+    in-memory database is private to its connection, so it is processed
+    on a single worker.
+    """
+    _import_command_deps()
     logger = get_logger('cli')
     dry_run = args.dry_run
 
@@ -632,10 +785,15 @@ def cmd_run_all(config: Config, args: argparse.Namespace) -> int:
 
     print_output(f"Processing {len(config.targets)} targets...", args.json, args.quiet)
 
-    results = []
-    failed = 0
+    targets = [_intern_target(t) for t in config.targets]
+    workers = min(len(targets), config.concurrency)
+    if config.database.path == ':memory:':
+        workers = 1
+
+    opened = []
+    pool: 'queue.SimpleQueue' = queue.SimpleQueue()
 
-    for target in config.targets:
+    def run_target(target: str) -> int:
         # Create a namespace with the target
         run_args = argparse.Namespace(
             target=target,
@@ -646,8 +804,40 @@ def cmd_run_all(config: Config, args: argparse.Namespace) -> int:
         )
 
         print_output(f"Processing {target}...", args.json, args.quiet)
-        exit_code = cmd_run(config, run_args)
+        client, store, ticket_client = pool.get()
+        try:
+            return cmd_run(
+                config, run_args,
+                client=client, store=store, ticket_client=ticket_client,
+            )
+        except Exception as e:
+            logger.error(f"run-all: {target} failed: {e}")
+            return 1
+        finally:
+            pool.put((client, store, ticket_client))
 
+    try:
+        for _ in range(workers):
+            client = create_irr_client(config)
+            opened.append(client)
+            store = SnapshotStore(config.database.path)
+            opened.append(store)
+            ticket_client = _create_ticketing_client(config) if config.ticketing.base_url else None
+            if ticket_client is not None:
+                opened.append(ticket_client)
+            pool.put((client, store, ticket_client))
+        _ensure_schema(store)  # every worker's store opens the same database
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields in submission order, so results follow config.targets.
+            exit_codes = list(executor.map(run_target, targets))
+    finally:
+        for resource in opened:
+            resource.close()
+
+    results = []
+    failed = 0
+    for target, exit_code in zip(targets, exit_codes):
         if exit_code != 0:
             failed += 1
             results.append({'target': target, 'status': 'failed'})
@@ -660,7 +850,7 @@ def cmd_run_all(config: Config, args: argparse.Namespace) -> int:
     )
 
     if args.json:
-        print(json.dumps({
+        print(_dumps({
             'total': len(config.targets),
             'succeeded': len(config.targets) - failed,
             'failed': failed,
@@ -672,40 +862,37 @@ def cmd_run_all(config: Config, args: argparse.Namespace) -> int:
 
 def cmd_history(config: Config, args: argparse.Namespace) -> int:
     """Show snapshot history."""
+    _import_command_deps()
     get_logger('cli')
     limit = args.limit
 
+    all_results = []
     store = SnapshotStore(config.database.path)
-    store.migrate()
-
     try:
+        _ensure_schema(store)
         if args.target:
-            targets = [args.target.upper()]
+            targets = [_intern_target(args.target)]
         else:
             targets = store.get_unique_targets()
-    finally:
-        store.close()
 
-    if not targets:
-        print_output("No snapshots found.", args.json, args.quiet)
-        if args.json:
-            print(json.dumps([]))
-        return 0
+        if not targets:
+            print_output("No snapshots found.", args.json, args.quiet)
+            if args.json:
+                print(_dumps([]))
+            return 0
 
-    all_results = []
-    store = SnapshotStore(config.database.path)
-    try:
         for target in targets:
-            snapshots = store.get_snapshot_history(target, limit)
+            # Counts come from their own columns; the prefix lists are never loaded.
+            snapshots = store.get_snapshot_history_summary(target, limit)
             if args.json:
                 all_results.append({
                     'target': target,
                     'snapshots': [
                         {
                             'id': s.id,
-                            'timestamp': datetime.fromtimestamp(s.timestamp).isoformat(),
-                            'ipv4_count': len(s.ipv4_prefixes),
-                            'ipv6_count': len(s.ipv6_prefixes),
+                            'timestamp': _ts_iso(s.timestamp),
+                            'ipv4_count': s.ipv4_count,
+                            'ipv6_count': s.ipv6_count,
                             'hash': s.content_hash,
                             'sources': s.irr_sources,
                         }
@@ -719,23 +906,34 @@ def cmd_history(config: Config, args: argparse.Namespace) -> int:
                     print("  No snapshots.\n")
                     continue
                 for s in snapshots:
-                    ts = datetime.fromtimestamp(s.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+                    ts = _ts_human(s.timestamp)
                     print(f"  [{s.id}] {ts}")
-                    print(f"       IPv4: {len(s.ipv4_prefixes):,} | IPv6: {len(s.ipv6_prefixes):,}")
-                    print(f"       Hash: {s.content_hash[:12]}... | Sources: {', '.join(s.irr_sources)}")
+                    print(f"       IPv4: {s.ipv4_count:,} | IPv6: {s.ipv6_count:,}")
+                    print(f"       Hash: {s.content_hash[:12]}... | Sources: {s.sources_csv}")
                     print()
     finally:
         store.close()
 
     if args.json:
-        print(json.dumps(all_results))
+        print(_dumps(all_results))
 
     return 0
 
 
+# Built on the first main() call and reused by later in-process calls.
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = create_parser()
+    return _PARSER
+
+
 def main():
     """Main entry point."""
-    parser = create_parser()
+    parser = _get_parser()
     args = parser.parse_args()
 
     if not args.command:
@@ -744,7 +942,7 @@ def main():
 
     # Load config
     try:
-        config = load_config(args.config)
+        config = load_config_cached(args.config)
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
@@ -1,15 +1,23 @@
 """Configuration loading and validation for IRR Automation."""
 
+import copy
 import os
 import re
+from collections import OrderedDict
+from functools import lru_cache
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+
+@dataclass(slots=True)
 class BGPQ4Config:
     """BGPQ4 tool configuration."""
     cmd: List[str] = field(default_factory=lambda: ["wsl", "bgpq4"])
@@ -18,13 +26,13 @@ class BGPQ4Config:
     aggregate: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration."""
     path: str = "./data/irr.sqlite"
 
 
-@dataclass
+@dataclass(slots=True)
 class TicketingConfig:
     """AT&T Ticketing API configuration."""
     base_url: str = ""
@@ -33,7 +41,7 @@ class TicketingConfig:
     max_retries: int = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration."""
     level: str = "INFO"
@@ -41,24 +49,25 @@ class LoggingConfig:
     file: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffConfig:
     """Diff computation configuration."""
     lookback_hours: int = 24
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamsConfig:
     """Microsoft Teams alert configuration via Power Automate webhook."""
     webhook_url: str = ""
     timeout_seconds: int = 15
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration container."""
     targets: List[str] = field(default_factory=list)
     api_url: Optional[str] = None  # When set, proxy all IRR queries via this URL
+    concurrency: int = 4  # Targets processed in parallel by run-all
     bgpq4: BGPQ4Config = field(default_factory=BGPQ4Config)
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
     ticketing: TicketingConfig = field(default_factory=TicketingConfig)
@@ -67,28 +76,71 @@ class Config:
     teams: TeamsConfig = field(default_factory=TeamsConfig)
 
 
-def _expand_env_vars(value: str) -> str:
-    """Expand environment variables in the format ${VAR_NAME}."""
-    pattern = r'\$\{([^}]+)\}'
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
 
-    def replacer(match):
-        var_name = match.group(1)
-        return os.environ.get(var_name, "")
 
-    return re.sub(pattern, replacer, value)
+def _expand_env_vars(value: str) -> str:
+    """Expand environment variables in the format ${VAR_NAME}."""
+    if '${' not in value:
+        return value
+    return _ENV_VAR_RE.sub(lambda m: os.environ.get(m.group(1), ""), value)
 
 
 def _expand_env_vars_recursive(obj):
-    """Recursively expand environment variables in a data structure."""
+    """Expand environment variables throughout a data structure.
+
+    Dicts and lists are updated in place (only the strings holding a ${VAR}
+    are replaced) and returned. Nesting is walked with an explicit stack,
+    so deep YAML costs no Python recursion. Each container is visited once,
+    so YAML aliases that share or contain themselves cannot loop the walk.
+    """
     if isinstance(obj, str):
         return _expand_env_vars(obj)
-    elif isinstance(obj, dict):
-        return {k: _expand_env_vars_recursive(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_expand_env_vars_recursive(item) for item in obj]
+    seen = {id(obj)}
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, str):
+                if '${' in value:
+                    node[key] = _expand_env_vars(value)
+            elif isinstance(value, (dict, list)) and id(value) not in seen:
+                seen.add(id(value))
+                stack.append(value)
     return obj
 
 
+# Environment overrides applied after the file is parsed:
+# (variable, config section or None for top level, field, strip whitespace).
+# An unset or empty (after stripping, where enabled) variable is ignored.
+_ENV_OVERRIDES = (
+    ('IRR_API_URL', None, 'api_url', False),
+    ('IRR_DB_PATH', 'database', 'path', False),
+    ('ABC_BASE_URL', 'ticketing', 'base_url', True),
+    ('ABC_TOKEN', 'ticketing', 'api_token', True),
+    ('IRR_LOG_LEVEL', 'logging', 'level', False),
+    ('IRR_LOG_FORMAT', 'logging', 'format', False),
+    ('TEAMS_WEBHOOK_URL', 'teams', 'webhook_url', True),
+)
+
+
+def _apply_env_overrides(config: Config) -> None:
+    """Apply the _ENV_OVERRIDES table to config, one environment lookup each."""
+    env = os.environ
+    for name, section, field_name, strip in _ENV_OVERRIDES:
+        value = env.get(name)
+        if value and strip:
+            value = value.strip()
+        if value:
+            setattr(getattr(config, section) if section else config, field_name, value)
+
+
 def load_config(config_path: str) -> Config:
     """
     Load configuration from a YAML file.
@@ -110,7 +162,7 @@ def load_config(config_path: str) -> Config:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
     with open(path, 'r', encoding='utf-8') as f:
-        raw_config = yaml.safe_load(f) or {}
+        raw_config = yaml.load(f, Loader=_YamlLoader) or {}
 
     # Expand environment variables
     raw_config = _expand_env_vars_recursive(raw_config)
@@ -125,8 +177,10 @@ def load_config(config_path: str) -> Config:
     # API proxy URL (when set, IRR queries go through the deployed API)
     if 'api_url' in raw_config:
         config.api_url = raw_config['api_url'] or None
-    if os.environ.get('IRR_API_URL'):
-        config.api_url = os.environ['IRR_API_URL']
+
+    # run-all worker count
+    if 'concurrency' in raw_config:
+        config.concurrency = raw_config['concurrency']
 
     # BGPQ4 config
     if 'bgpq4' in raw_config:
@@ -153,10 +207,6 @@ def load_config(config_path: str) -> Config:
             path=db_raw.get('path', config.database.path),
         )
 
-    # Apply environment variable overrides for database
-    if os.environ.get('IRR_DB_PATH'):
-        config.database.path = os.environ['IRR_DB_PATH']
-
     # Ticketing config
     if 'ticketing' in raw_config:
         tick_raw = raw_config['ticketing']
@@ -167,12 +217,6 @@ def load_config(config_path: str) -> Config:
             max_retries=tick_raw.get('max_retries', config.ticketing.max_retries),
         )
 
-    # Apply environment variable overrides for ticketing (only if not empty)
-    if os.environ.get('ABC_BASE_URL', '').strip():
-        config.ticketing.base_url = os.environ['ABC_BASE_URL'].strip()
-    if os.environ.get('ABC_TOKEN', '').strip():
-        config.ticketing.api_token = os.environ['ABC_TOKEN'].strip()
-
     # Logging config
     if 'logging' in raw_config:
         log_raw = raw_config['logging']
@@ -182,12 +226,6 @@ def load_config(config_path: str) -> Config:
             file=log_raw.get('file'),
         )
 
-    # Apply environment variable overrides for logging
-    if os.environ.get('IRR_LOG_LEVEL'):
-        config.logging.level = os.environ['IRR_LOG_LEVEL']
-    if os.environ.get('IRR_LOG_FORMAT'):
-        config.logging.format = os.environ['IRR_LOG_FORMAT']
-
     # Diff config
     if 'diff' in raw_config:
         diff_raw = raw_config['diff']
@@ -203,9 +241,8 @@ def load_config(config_path: str) -> Config:
             timeout_seconds=teams_raw.get('timeout_seconds', config.teams.timeout_seconds),
         )
 
-    # Apply environment variable override for Teams webhook (only if not empty)
-    if os.environ.get('TEAMS_WEBHOOK_URL', '').strip():
-        config.teams.webhook_url = os.environ['TEAMS_WEBHOOK_URL'].strip()
+    # Environment variable overrides (IRR_*, ABC_*, TEAMS_*)
+    _apply_env_overrides(config)
 
     # Validate configuration
     validate_config(config)
@@ -213,8 +250,57 @@ def load_config(config_path: str) -> Config:
     return config
 
 
+# Parsed configs keyed by resolved path, tagged with the file's
+# (mtime_ns, size) and the environment they were built under.
+_CONFIG_CACHE: "OrderedDict[str, Tuple[int, int, FrozenSet[Tuple[str, str]], Config]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 16
+
+
+def load_config_cached(config_path: str) -> Config:
+    """
+    Load configuration, reusing the parsed result while the file is unchanged.
+
+    The cache is validated against the file's mtime and size and against the
+    process environment, since ${VAR} interpolation and the IRR_*/ABC_*
+    overrides both read it. Edits and environment changes are picked up on
+    the next call. Each call returns a deep copy, so callers may mutate the
+    result freely.
+
+    Args:
+        config_path: Path to the YAML configuration file.
+
+    Returns:
+        Config object with all settings.
+
+    Raises:
+        FileNotFoundError: If config file doesn't exist.
+        yaml.YAMLError: If config file is invalid YAML.
+    """
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return load_config(config_path)  # raises the usual FileNotFoundError
+
+    key = os.path.realpath(config_path)
+    env = frozenset(os.environ.items())
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[:3] == (st.st_mtime_ns, st.st_size, env):
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[3])
+
+    config = load_config(config_path)
+    _CONFIG_CACHE[key] = (st.st_mtime_ns, st.st_size, env, config)
+    _CONFIG_CACHE.move_to_end(key)
+    while len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(config)
+
+
 # Valid IRR sources for bgpq4 -S flag
-VALID_BGPQ4_SOURCES = {'RIPE', 'RADB', 'ARIN', 'APNIC', 'LACNIC', 'AFRINIC', 'RPKI'}
+VALID_BGPQ4_SOURCES = frozenset({'RIPE', 'RADB', 'ARIN', 'APNIC', 'LACNIC', 'AFRINIC', 'RPKI'})
+
+_VALID_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+_VALID_LOG_FORMATS = frozenset({'json', 'text'})
 
 
 class ConfigValidationError(ValueError):
@@ -222,68 +308,106 @@ class ConfigValidationError(ValueError):
     pass
 
 
+class _ValidatedFields(NamedTuple):
+    """The config values validate_config checks, as a hashable cache key."""
+    concurrency: int
+    bgpq4_sources: Tuple[str, ...]
+    bgpq4_timeout_seconds: int
+    bgpq4_cmd: Tuple[str, ...]
+    ticketing_timeout_seconds: int
+    ticketing_max_retries: int
+    diff_lookback_hours: int
+    logging_level: str
+    logging_format: str
+    teams_webhook_url: str
+    teams_timeout_seconds: int
+
+
 def validate_config(config: Config) -> None:
     """
     Validate configuration has required fields and valid values.
 
+    Results are memoized on the validated values, so re-validating an
+    identical configuration only builds the key.
+
     Args:
         config: The configuration object to validate.
 
     Raises:
         ConfigValidationError: If validation fails.
     """
+    errors = _validation_errors(_ValidatedFields(
+        concurrency=config.concurrency,
+        bgpq4_sources=tuple(config.bgpq4.sources),
+        bgpq4_timeout_seconds=config.bgpq4.timeout_seconds,
+        bgpq4_cmd=tuple(config.bgpq4.cmd),
+        ticketing_timeout_seconds=config.ticketing.timeout_seconds,
+        ticketing_max_retries=config.ticketing.max_retries,
+        diff_lookback_hours=config.diff.lookback_hours,
+        logging_level=config.logging.level,
+        logging_format=config.logging.format,
+        teams_webhook_url=config.teams.webhook_url,
+        teams_timeout_seconds=config.teams.timeout_seconds,
+    ))
+    if errors:
+        raise ConfigValidationError(
+            "Configuration validation failed:\n  - " + "\n  - ".join(errors)
+        )
+
+
+@lru_cache(maxsize=64)
+def _validation_errors(fields: _ValidatedFields) -> Tuple[str, ...]:
+    """Return the validation error messages for the given values."""
     errors = []
 
+    if fields.concurrency < 1:
+        errors.append("concurrency must be at least 1")
+
     # Validate BGPQ4 sources
-    for src in config.bgpq4.sources:
+    for src in fields.bgpq4_sources:
         if src.upper() not in VALID_BGPQ4_SOURCES:
             errors.append(
                 f"Unknown BGPQ4 source: {src}. "
                 f"Valid sources: {sorted(VALID_BGPQ4_SOURCES)}"
             )
-    if not config.bgpq4.sources:
+    if not fields.bgpq4_sources:
         errors.append("bgpq4.sources must not be empty")
 
     # Validate BGPQ4 timeout
-    if config.bgpq4.timeout_seconds <= 0:
+    if fields.bgpq4_timeout_seconds <= 0:
         errors.append("bgpq4.timeout_seconds must be positive")
 
     # Validate BGPQ4 command
-    if not config.bgpq4.cmd:
+    if not fields.bgpq4_cmd:
         errors.append("bgpq4.cmd must not be empty")
 
     # Validate ticketing numeric fields
-    if config.ticketing.timeout_seconds <= 0:
+    if fields.ticketing_timeout_seconds <= 0:
         errors.append("ticketing.timeout_seconds must be positive")
-    if config.ticketing.max_retries < 0:
+    if fields.ticketing_max_retries < 0:
         errors.append("ticketing.max_retries must be non-negative")
 
-    if config.diff.lookback_hours <= 0:
+    if fields.diff_lookback_hours <= 0:
         errors.append("diff.lookback_hours must be positive")
 
     # Validate logging level
-    valid_levels = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
-    if config.logging.level.upper() not in valid_levels:
-        errors.append(f"logging.level must be one of: {valid_levels}")
+    if fields.logging_level.upper() not in _VALID_LOG_LEVELS:
+        errors.append(f"logging.level must be one of: {sorted(_VALID_LOG_LEVELS)}")
 
     # Validate logging format
-    valid_formats = {'json', 'text'}
-    if config.logging.format.lower() not in valid_formats:
-        errors.append(f"logging.format must be one of: {valid_formats}")
+    if fields.logging_format.lower() not in _VALID_LOG_FORMATS:
+        errors.append(f"logging.format must be one of: {sorted(_VALID_LOG_FORMATS)}")
 
     # Validate Teams webhook URL if provided
-    if config.teams.webhook_url:
-        if not config.teams.webhook_url.startswith(('http://', 'https://')):
+    if fields.teams_webhook_url:
+        if not fields.teams_webhook_url.startswith(('http://', 'https://')):
             errors.append("teams.webhook_url must be a valid HTTP(S) URL")
 
     # Validate Teams timeout
-    if config.teams.timeout_seconds <= 0:
+    if fields.teams_timeout_seconds <= 0:
         errors.append("teams.timeout_seconds must be positive")
 
-    if errors:
-        raise ConfigValidationError(
-            "Configuration validation failed:\n  - " + "\n  - ".join(errors)
-        )
+    return tuple(errors)
 
 
 def get_default_config() -> Config:
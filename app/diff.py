@@ -2,20 +2,23 @@
 
 import hashlib
 import json
-from dataclasses import dataclass, field
-from typing import List, Optional, Set
+import operator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from app.store import Snapshot
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffResult:
     """Result of comparing two snapshots."""
     target: str
-    added_v4: List[str] = field(default_factory=list)
-    removed_v4: List[str] = field(default_factory=list)
-    added_v6: List[str] = field(default_factory=list)
-    removed_v6: List[str] = field(default_factory=list)
+    # Sorted tuples: immutable, so one result can be shared between threads.
+    added_v4: Tuple[str, ...] = ()
+    removed_v4: Tuple[str, ...] = ()
+    added_v6: Tuple[str, ...] = ()
+    removed_v6: Tuple[str, ...] = ()
     has_changes: bool = False
     diff_hash: str = ""
     new_snapshot_id: Optional[int] = None
@@ -42,10 +45,10 @@ class DiffResult:
 
 def compute_diff_hash(
     target: str,
-    added_v4: List[str],
-    removed_v4: List[str],
-    added_v6: List[str],
-    removed_v6: List[str],
+    added_v4: Iterable[str],
+    removed_v4: Iterable[str],
+    added_v6: Iterable[str],
+    removed_v6: Iterable[str],
 ) -> str:
     """
     Compute SHA256 hash of diff for idempotency.
@@ -55,23 +58,102 @@ def compute_diff_hash(
 
     Args:
         target: ASN or AS-SET.
-        added_v4: List of added IPv4 prefixes.
-        removed_v4: List of removed IPv4 prefixes.
-        added_v6: List of added IPv6 prefixes.
-        removed_v6: List of removed IPv6 prefixes.
+        added_v4: Added IPv4 prefixes.
+        removed_v4: Removed IPv4 prefixes.
+        added_v6: Added IPv6 prefixes.
+        removed_v6: Removed IPv6 prefixes.
 
     Returns:
         Hex-encoded SHA256 hash.
     """
-    content = json.dumps({
-        'target': target,
-        'added_v4': sorted(added_v4),
-        'removed_v4': sorted(removed_v4),
-        'added_v6': sorted(added_v6),
-        'removed_v6': sorted(removed_v6),
-    }, sort_keys=True)
+    # Hashes the same bytes as json.dumps({...}, sort_keys=True) over the
+    # whole dict, one list at a time, so the full document is never built.
+    h = hashlib.sha256()
+    sep = b'{'
+    for key, prefixes in (
+        ('added_v4', added_v4),
+        ('added_v6', added_v6),
+        ('removed_v4', removed_v4),
+        ('removed_v6', removed_v6),
+    ):
+        h.update(sep + f'"{key}": '.encode('utf-8'))
+        h.update(json.dumps(sorted(prefixes)).encode('utf-8'))
+        sep = b', '
+    h.update(b', "target": ' + json.dumps(target).encode('utf-8') + b'}')
+    return h.hexdigest()
+
+
+def _strictly_increasing(seq: Sequence[str], floor: Optional[str]) -> bool:
+    """Whether seq is strictly increasing and entirely greater than floor."""
+    if not seq:
+        return True
+    if floor is not None and seq[0] <= floor:
+        return False
+    return all(map(operator.lt, seq, islice(seq, 1, None)))
+
+
+def _sorted_unique(prefixes: Sequence[str]) -> Tuple[str, ...]:
+    """Return prefixes sorted and deduplicated, skipping the work if they already are."""
+    if _strictly_increasing(prefixes, None):
+        return tuple(prefixes)
+    return tuple(sorted(set(prefixes)))
+
+
+def _merge_diff(
+    new: Sequence[str], old: Sequence[str]
+) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Diff two strictly increasing prefix lists in one merge pass.
 
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    Snapshots are stored sorted, so this avoids hashing every prefix into
+    two sets. Returns None as soon as either input turns out not to be
+    strictly increasing (unsorted or duplicated).
+    """
+    added: List[str] = []
+    removed: List[str] = []
+    i = j = 0
+    n, m = len(new), len(old)
+    last_new = last_old = None
+    while i < n and j < m:
+        x, y = new[i], old[j]
+        if x == y:
+            if last_new is not None and x <= last_new:
+                return None
+            last_new = last_old = x
+            i += 1
+            j += 1
+        elif x < y:
+            if last_new is not None and x <= last_new:
+                return None
+            last_new = x
+            added.append(x)
+            i += 1
+        else:
+            if last_old is not None and y <= last_old:
+                return None
+            last_old = y
+            removed.append(y)
+            j += 1
+
+    new_tail, old_tail = new[i:], old[j:]
+    if not (_strictly_increasing(new_tail, last_new) and _strictly_increasing(old_tail, last_old)):
+        return None
+    added.extend(new_tail)
+    removed.extend(old_tail)
+    return tuple(added), tuple(removed)
+
+
+def _diff_prefixes(
+    new: Sequence[str], old: Sequence[str]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Return sorted (added, removed) prefixes between two prefix lists."""
+    merged = _merge_diff(new, old)
+    if merged is not None:
+        return merged
+    # Unsorted or duplicated input: fall back to set differences.
+    new_set: Set[str] = set(new)
+    old_set: Set[str] = set(old)
+    return tuple(sorted(new_set - old_set)), tuple(sorted(old_set - new_set))
 
 
 def compute_diff(
@@ -86,7 +168,7 @@ def compute_diff(
         previous: The previous (old) snapshot. None if this is the first snapshot.
 
     Returns:
-        DiffResult with lists of added and removed prefixes.
+        DiffResult with sorted tuples of added and removed prefixes.
     """
     result = DiffResult(
         target=current.target,
@@ -94,42 +176,74 @@ def compute_diff(
         old_snapshot_id=previous.id if previous else None,
     )
 
-    # Convert to sets for efficient comparison
-    current_v4: Set[str] = set(current.ipv4_prefixes)
-    current_v6: Set[str] = set(current.ipv6_prefixes)
+    if (
+        previous is not None
+        and current.content_hash
+        and current.content_hash == previous.content_hash
+    ):
+        # Equal content hashes mean equal prefix lists: nothing to compare.
+        return result
 
     if previous is None:
         # First snapshot - all prefixes are "added"
-        result.added_v4 = sorted(current_v4)
-        result.added_v6 = sorted(current_v6)
-        result.has_changes = bool(current_v4 or current_v6)
+        result.added_v4 = _sorted_unique(current.ipv4_prefixes)
+        result.added_v6 = _sorted_unique(current.ipv6_prefixes)
+        result.has_changes = bool(result.added_v4 or result.added_v6)
     else:
-        previous_v4: Set[str] = set(previous.ipv4_prefixes)
-        previous_v6: Set[str] = set(previous.ipv6_prefixes)
-
-        # Compute differences
-        result.added_v4 = sorted(current_v4 - previous_v4)
-        result.removed_v4 = sorted(previous_v4 - current_v4)
-        result.added_v6 = sorted(current_v6 - previous_v6)
-        result.removed_v6 = sorted(previous_v6 - current_v6)
+        result.added_v4, result.removed_v4 = _diff_prefixes(
+            current.ipv4_prefixes, previous.ipv4_prefixes
+        )
+        result.added_v6, result.removed_v6 = _diff_prefixes(
+            current.ipv6_prefixes, previous.ipv6_prefixes
+        )
 
         result.has_changes = bool(
             result.added_v4 or result.removed_v4 or
             result.added_v6 or result.removed_v6
         )
 
-    # Compute diff hash
-    result.diff_hash = compute_diff_hash(
-        target=result.target,
-        added_v4=result.added_v4,
-        removed_v4=result.removed_v4,
-        added_v6=result.added_v6,
-        removed_v6=result.removed_v6,
-    )
+    # Only diffs with changes are ticketed, so only they need an idempotency
+    # hash; unchanged diffs keep the empty default.
+    if result.has_changes:
+        result.diff_hash = compute_diff_hash(
+            target=result.target,
+            added_v4=result.added_v4,
+            removed_v4=result.removed_v4,
+            added_v6=result.added_v6,
+            removed_v6=result.removed_v6,
+        )
 
     return result
 
 
+# Prefixes listed per section by format_diff_human before "... and N more".
+_HUMAN_PREVIEW = 10
+
+
+def _section_lines(label: str, prefixes: Sequence[str], sign: str) -> Iterator[str]:
+    """Yield one format_diff_human section: a header and up to 10 prefixes."""
+    yield f"  {label} ({len(prefixes)}):"
+    for prefix in prefixes[:_HUMAN_PREVIEW]:
+        yield f"    {sign} {prefix}"
+    if len(prefixes) > _HUMAN_PREVIEW:
+        yield f"    ... and {len(prefixes) - _HUMAN_PREVIEW} more"
+
+
+def _human_lines(diff: DiffResult) -> Iterator[str]:
+    yield f"Changes for {diff.target}:"
+    if not diff.has_changes:
+        yield "  No changes detected"
+        return
+    for label, prefixes, sign in (
+        ("Added IPv4", diff.added_v4, "+"),
+        ("Removed IPv4", diff.removed_v4, "-"),
+        ("Added IPv6", diff.added_v6, "+"),
+        ("Removed IPv6", diff.removed_v6, "-"),
+    ):
+        if prefixes:
+            yield from _section_lines(label, prefixes, sign)
+
+
 def format_diff_human(diff: DiffResult) -> str:
     """
     Format a diff result as human-readable text.
@@ -140,41 +254,7 @@ def format_diff_human(diff: DiffResult) -> str:
     Returns:
         Human-readable string representation.
     """
-    lines = [f"Changes for {diff.target}:"]
-
-    if not diff.has_changes:
-        lines.append("  No changes detected")
-        return '\n'.join(lines)
-
-    if diff.added_v4:
-        lines.append(f"  Added IPv4 ({len(diff.added_v4)}):")
-        for prefix in diff.added_v4[:10]:  # Show first 10
-            lines.append(f"    + {prefix}")
-        if len(diff.added_v4) > 10:
-            lines.append(f"    ... and {len(diff.added_v4) - 10} more")
-
-    if diff.removed_v4:
-        lines.append(f"  Removed IPv4 ({len(diff.removed_v4)}):")
-        for prefix in diff.removed_v4[:10]:
-            lines.append(f"    - {prefix}")
-        if len(diff.removed_v4) > 10:
-            lines.append(f"    ... and {len(diff.removed_v4) - 10} more")
-
-    if diff.added_v6:
-        lines.append(f"  Added IPv6 ({len(diff.added_v6)}):")
-        for prefix in diff.added_v6[:10]:
-            lines.append(f"    + {prefix}")
-        if len(diff.added_v6) > 10:
-            lines.append(f"    ... and {len(diff.added_v6) - 10} more")
-
-    if diff.removed_v6:
-        lines.append(f"  Removed IPv6 ({len(diff.removed_v6)}):")
-        for prefix in diff.removed_v6[:10]:
-            lines.append(f"    - {prefix}")
-        if len(diff.removed_v6) > 10:
-            lines.append(f"    ... and {len(diff.removed_v6) - 10} more")
-
-    return '\n'.join(lines)
+    return '\n'.join(_human_lines(diff))
 
 
 def format_diff_json(diff: DiffResult) -> dict:
@@ -9,6 +9,20 @@ from typing import Any, Dict, Optional
 
 from app.config import LoggingConfig
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+_UTC = timezone.utc
+
+
+def _dumps(log_entry: Dict[str, Any]) -> str:
+    """Encode a log entry, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(log_entry, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(log_entry)
+
 
 class JSONFormatter(logging.Formatter):
     """JSON log formatter for structured logging."""
@@ -16,7 +30,8 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_entry: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # record.created is when the call was made; no second clock read.
+            "timestamp": datetime.fromtimestamp(record.created, _UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -27,10 +42,14 @@ class JSONFormatter(logging.Formatter):
             log_entry["context"] = record.context
 
         # Add exception info if present
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+        # Cache the traceback text on the record, as logging.Formatter does,
+        # so a record sent to several handlers is formatted once.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_entry["exception"] = record.exc_text
 
-        return json.dumps(log_entry)
+        return _dumps(log_entry)
 
 
 class TextFormatter(logging.Formatter):
@@ -54,14 +73,22 @@ class TextFormatter(logging.Formatter):
         return base
 
 
+# Formatters keep no per-record state, so setup_logging shares these.
+_JSON_FORMATTER = JSONFormatter()
+_TEXT_FORMATTER = TextFormatter()
+
+
 class ContextLogger(logging.LoggerAdapter):
     """Logger adapter that supports context injection."""
 
     def process(self, msg: str, kwargs: Dict[str, Any]):
         """Process log message with context."""
-        # Merge adapter's extra with call-time extra
-        extra = kwargs.get('extra', {})
-        if self.extra:
+        # Merge adapter's extra with call-time extra, copying only when both
+        # have entries (records copy extra into their own __dict__ anyway).
+        extra = kwargs.get('extra')
+        if not extra:
+            extra = self.extra
+        elif self.extra:
             extra = {**self.extra, **extra}
 
         # Ensure context is preserved for structured logging
@@ -91,9 +118,9 @@ def setup_logging(config: LoggingConfig) -> logging.Logger:
 
     # Choose formatter based on config
     if config.format.lower() == "json":
-        formatter = JSONFormatter()
+        formatter = _JSON_FORMATTER
     else:
-        formatter = TextFormatter()
+        formatter = _TEXT_FORMATTER
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -117,10 +144,17 @@ def setup_logging(config: LoggingConfig) -> logging.Logger:
     return logger
 
 
+# Context-free adapters by name. Adapters with a context are built per call,
+# so the cache cannot grow with every context dict passed in.
+_LOGGER_CACHE: Dict[str, ContextLogger] = {}
+
+
 def get_logger(name: str, context: Optional[Dict[str, Any]] = None) -> ContextLogger:
     """
     Get a logger with optional context.
 
+    Calls without a context return the same adapter for a given name.
+
     Args:
         name: Logger name (usually module name).
         context: Optional context dict to include in all log messages.
@@ -128,8 +162,14 @@ def get_logger(name: str, context: Optional[Dict[str, Any]] = None) -> ContextLo
     Returns:
         ContextLogger instance.
     """
-    base_logger = logging.getLogger(f"app.{name}")
-    return ContextLogger(base_logger, context or {})
+    if context:
+        return ContextLogger(logging.getLogger(f"app.{name}"), context)
+    adapter = _LOGGER_CACHE.get(name)
+    if adapter is None:
+        adapter = _LOGGER_CACHE.setdefault(
+            name, ContextLogger(logging.getLogger(f"app.{name}"), {})
+        )
+    return adapter
 
 
 def log_with_context(
@@ -149,6 +189,8 @@ def log_with_context(
         context: Context dict to include in structured log.
         **kwargs: Additional keyword arguments for logging.
     """
+    if not logger.isEnabledFor(level):
+        return
     extra = kwargs.pop('extra', {})
     if context:
         extra['context'] = context
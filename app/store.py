@@ -3,11 +3,22 @@
 import hashlib
 import json
 import sqlite3
+import threading
 import time
 from contextlib import contextmanager
+from functools import cached_property, wraps
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Generator
+from typing import Iterable, List, Optional, Generator, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# Reads decode with orjson when available. Writes stay on json.dumps: the
+# content hash is taken over its exact output (separators included).
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 
 @dataclass
@@ -22,25 +33,57 @@ class Snapshot:
     ipv6_prefixes: List[str]
     content_hash: str
     created_at: int
+    # Stored alongside the prefix lists; filled from them when not given.
+    ipv4_count: Optional[int] = None
+    ipv6_count: Optional[int] = None
+
+    def __post_init__(self):
+        if self.ipv4_count is None:
+            self.ipv4_count = len(self.ipv4_prefixes)
+        if self.ipv6_count is None:
+            self.ipv6_count = len(self.ipv6_prefixes)
+
+    @cached_property
+    def sources_csv(self) -> str:
+        """IRR sources joined for display, e.g. "RADB, RIPE"."""
+        return ', '.join(self.irr_sources)
 
 
 @dataclass
+class SnapshotSummary:
+    """Snapshot metadata and prefix counts, without the prefix lists."""
+    id: int
+    target: str
+    target_type: str
+    timestamp: int
+    irr_sources: Tuple[str, ...]
+    ipv4_count: int
+    ipv6_count: int
+    content_hash: str
+
+    @cached_property
+    def sources_csv(self) -> str:
+        """IRR sources joined for display, e.g. "RADB, RIPE"."""
+        return ', '.join(self.irr_sources)
+
+
+@dataclass(slots=True)
 class Diff:
     """Represents a diff between two snapshots."""
     id: int
     new_snapshot_id: int
     old_snapshot_id: Optional[int]
     target: str
-    added_v4: List[str]
-    removed_v4: List[str]
-    added_v6: List[str]
-    removed_v6: List[str]
+    added_v4: Tuple[str, ...]
+    removed_v4: Tuple[str, ...]
+    added_v6: Tuple[str, ...]
+    removed_v6: Tuple[str, ...]
     diff_hash: str
     has_changes: bool
     created_at: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Ticket:
     """Represents a ticket record."""
     id: int
@@ -64,7 +107,9 @@ CREATE TABLE IF NOT EXISTS snapshots (
     ipv4_prefixes TEXT NOT NULL,
     ipv6_prefixes TEXT NOT NULL,
     content_hash TEXT NOT NULL,
-    created_at INTEGER NOT NULL
+    created_at INTEGER NOT NULL,
+    ipv4_count INTEGER NOT NULL DEFAULT 0,
+    ipv6_count INTEGER NOT NULL DEFAULT 0
 );
 
 -- Stores computed diffs between snapshots
@@ -104,26 +149,54 @@ CREATE INDEX IF NOT EXISTS idx_diffs_target_created ON diffs(target, created_at
 CREATE INDEX IF NOT EXISTS idx_tickets_target_created ON tickets(target, created_at DESC);
 """
 
+# Snapshot columns needed for a SnapshotSummary (everything but the prefix lists).
+_SUMMARY_COLUMNS = (
+    "s.id, s.target, s.target_type, s.timestamp, s.irr_sources, "
+    "s.ipv4_count, s.ipv6_count, s.content_hash"
+)
+
 
-def compute_content_hash(ipv4_prefixes: List[str], ipv6_prefixes: List[str]) -> str:
+def compute_content_hash(ipv4_prefixes: Iterable[str], ipv6_prefixes: Iterable[str]) -> str:
     """
     Compute SHA256 hash of prefix lists for deduplication.
 
     Args:
-        ipv4_prefixes: List of IPv4 CIDR prefixes.
-        ipv6_prefixes: List of IPv6 CIDR prefixes.
+        ipv4_prefixes: IPv4 CIDR prefixes.
+        ipv6_prefixes: IPv6 CIDR prefixes.
 
     Returns:
         Hex-encoded SHA256 hash.
     """
     # Sort for consistent hashing
-    sorted_v4 = sorted(ipv4_prefixes)
-    sorted_v6 = sorted(ipv6_prefixes)
+    return _content_hash_from_json(
+        json.dumps(sorted(ipv4_prefixes)),
+        json.dumps(sorted(ipv6_prefixes)),
+    )
+
+
+def _content_hash_from_json(v4_json: str, v6_json: str) -> str:
+    """Hash already-encoded sorted prefix lists.
+
+    Builds the same string as json.dumps({"v4": ..., "v6": ...}, sort_keys=True),
+    so hashes match snapshots stored before the encodings were shared.
+    """
+    # Fed piecewise, so the two (possibly multi-MB) lists are not first
+    # copied into one combined document.
+    h = hashlib.sha256(b'{"v4": ')
+    h.update(v4_json.encode('utf-8'))
+    h.update(b', "v6": ')
+    h.update(v6_json.encode('utf-8'))
+    h.update(b'}')
+    return h.hexdigest()
 
-    # Combine into a single string
-    content = json.dumps({"v4": sorted_v4, "v6": sorted_v6}, sort_keys=True)
 
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+def _locked(method):
+    """Run a SnapshotStore method while holding the store's connection lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class SnapshotStore:
@@ -144,24 +217,63 @@ class SnapshotStore:
 
         self._conn: Optional[sqlite3.Connection] = None
         self._in_transaction: bool = False
+        # Guards the connection and _in_transaction. Every method that talks
+        # to the database holds it, and transaction() holds it for the whole
+        # block, so threads sharing a store never interleave statements or
+        # see each other's uncommitted writes. Re-entrant so locked methods
+        # can run inside a transaction or call each other.
+        self._lock = threading.RLock()
 
     @property
     def conn(self) -> sqlite3.Connection:
         """Get or create database connection."""
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path)
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
-
+        with self._lock:
+            if self._conn is None:
+                # Stores cross threads: run-all hands each one between its
+                # workers, and the API shares one between its threadpool
+                # endpoints and the event loop. The store's lock serializes
+                # that use, so the same-thread check is left off.
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+                self._configure(self._conn)
+            return self._conn
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> None:
+        """Apply per-connection pragmas for faster writes."""
+        # WAL lets readers run alongside the writer and, with NORMAL sync,
+        # fsyncs at checkpoints rather than on every commit. In-memory
+        # databases ignore journal_mode and keep their own.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 64 MiB page cache (negative = KiB) instead of the 2 MiB default, so
+        # snapshot rows with large prefix blobs stay hot across lookups.
+        conn.execute("PRAGMA cache_size=-65536")
+
+    @_locked
     def close(self):
         """Close database connection."""
         if self._conn:
             self._conn.close()
             self._conn = None
 
+    @_locked
     def migrate(self):
-        """Create database tables if they don't exist."""
+        """Create database tables if they don't exist and add newer columns."""
         self.conn.executescript(SCHEMA_SQL)
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(snapshots)")}
+        if 'ipv4_count' not in columns:
+            # Databases created before the count columns: add and backfill them.
+            self.conn.executescript(
+                """
+                ALTER TABLE snapshots ADD COLUMN ipv4_count INTEGER NOT NULL DEFAULT 0;
+                ALTER TABLE snapshots ADD COLUMN ipv6_count INTEGER NOT NULL DEFAULT 0;
+                UPDATE snapshots SET
+                    ipv4_count = json_array_length(ipv4_prefixes),
+                    ipv6_count = json_array_length(ipv6_prefixes);
+                """
+            )
         self.conn.commit()
 
     @contextmanager
@@ -178,18 +290,21 @@ class SnapshotStore:
                 store.save_diff(...)
                 store.save_ticket(...)
 
+        Other threads using the store wait until the block has finished.
+
         Yields:
             The database connection.
         """
-        self._in_transaction = True
-        try:
-            yield self.conn
-            self.conn.commit()
-        except Exception:
-            self.conn.rollback()
-            raise
-        finally:
-            self._in_transaction = False
+        with self._lock:
+            self._in_transaction = True
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                self._in_transaction = False
 
     def _commit_if_not_in_transaction(self) -> None:
         """Commit the current transaction if not in a managed transaction."""
@@ -205,8 +320,8 @@ class SnapshotStore:
         target: str,
         target_type: str,
         irr_sources: List[str],
-        ipv4_prefixes: List[str],
-        ipv6_prefixes: List[str],
+        ipv4_prefixes: Iterable[str],
+        ipv6_prefixes: Iterable[str],
     ) -> int:
         """
         Save a new prefix snapshot.
@@ -215,36 +330,81 @@ class SnapshotStore:
             target: ASN or AS-SET (e.g., "AS15169").
             target_type: "asn" or "as-set".
             irr_sources: List of IRR sources queried.
-            ipv4_prefixes: List of IPv4 CIDR prefixes.
-            ipv6_prefixes: List of IPv6 CIDR prefixes.
+            ipv4_prefixes: IPv4 CIDR prefixes (any iterable; not copied first).
+            ipv6_prefixes: IPv6 CIDR prefixes (any iterable; not copied first).
 
         Returns:
             ID of the created snapshot.
         """
+        return self.create_snapshot(
+            target, target_type, irr_sources, ipv4_prefixes, ipv6_prefixes
+        ).id
+
+    @_locked
+    def create_snapshot(
+        self,
+        target: str,
+        target_type: str,
+        irr_sources: List[str],
+        ipv4_prefixes: Iterable[str],
+        ipv6_prefixes: Iterable[str],
+    ) -> Snapshot:
+        """
+        Save a new prefix snapshot and return it.
+
+        The returned Snapshot is built from the values just written, so
+        callers need not read the row (and its prefix blobs) back.
+
+        Args:
+            Same as save_snapshot().
+
+        Returns:
+            The created snapshot, with sorted prefix lists.
+        """
         now = int(time.time())
-        content_hash = compute_content_hash(ipv4_prefixes, ipv6_prefixes)
+        # Sort and encode each family once; the stored column and the content
+        # hash share the same encoding.
+        sorted_v4 = sorted(ipv4_prefixes)
+        sorted_v6 = sorted(ipv6_prefixes)
+        v4_json = json.dumps(sorted_v4)
+        v6_json = json.dumps(sorted_v6)
+        content_hash = _content_hash_from_json(v4_json, v6_json)
+        irr_sources = list(irr_sources)
 
         cursor = self.conn.execute(
             """
             INSERT INTO snapshots
                 (target, target_type, timestamp, irr_sources, ipv4_prefixes,
-                 ipv6_prefixes, content_hash, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                 ipv6_prefixes, content_hash, created_at, ipv4_count, ipv6_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 target,
                 target_type,
                 now,
                 json.dumps(irr_sources),
-                json.dumps(sorted(ipv4_prefixes)),
-                json.dumps(sorted(ipv6_prefixes)),
+                v4_json,
+                v6_json,
                 content_hash,
                 now,
+                len(sorted_v4),
+                len(sorted_v6),
             )
         )
         self._commit_if_not_in_transaction()
-        return cursor.lastrowid
+        return Snapshot(
+            id=cursor.lastrowid,
+            target=target,
+            target_type=target_type,
+            timestamp=now,
+            irr_sources=irr_sources,
+            ipv4_prefixes=sorted_v4,
+            ipv6_prefixes=sorted_v6,
+            content_hash=content_hash,
+            created_at=now,
+        )
 
+    @_locked
     def get_latest_snapshot(self, target: str) -> Optional[Snapshot]:
         """
         Get the most recent snapshot for a target.
@@ -267,6 +427,7 @@ class SnapshotStore:
         row = cursor.fetchone()
         return self._row_to_snapshot(row) if row else None
 
+    @_locked
     def get_snapshot_before(self, target: str, timestamp: int) -> Optional[Snapshot]:
         """
         Get the most recent snapshot before a given timestamp.
@@ -290,6 +451,7 @@ class SnapshotStore:
         row = cursor.fetchone()
         return self._row_to_snapshot(row) if row else None
 
+    @_locked
     def get_all_targets(self) -> List[Snapshot]:
         """Get the latest snapshot for every unique target."""
         cursor = self.conn.execute(
@@ -306,6 +468,24 @@ class SnapshotStore:
         )
         return [self._row_to_snapshot(row) for row in cursor.fetchall()]
 
+    @_locked
+    def get_all_targets_summary(self) -> List[SnapshotSummary]:
+        """Get the latest snapshot summary for every unique target, without prefix lists."""
+        cursor = self.conn.execute(
+            f"""
+            SELECT {_SUMMARY_COLUMNS}
+            FROM snapshots s
+            INNER JOIN (
+                SELECT target, MAX(timestamp) AS max_ts
+                FROM snapshots
+                GROUP BY target
+            ) latest ON s.target = latest.target AND s.timestamp = latest.max_ts
+            ORDER BY s.target ASC
+            """
+        )
+        return [self._row_to_summary(row) for row in cursor.fetchall()]
+
+    @_locked
     def get_snapshot_history(self, target: str, limit: int = 10) -> List[Snapshot]:
         """
         Get snapshot history for a target.
@@ -328,6 +508,31 @@ class SnapshotStore:
         )
         return [self._row_to_snapshot(row) for row in cursor.fetchall()]
 
+    @_locked
+    def get_snapshot_history_summary(self, target: str, limit: int = 10) -> List[SnapshotSummary]:
+        """
+        Get snapshot history for a target without decoding the prefix lists.
+
+        Args:
+            target: ASN or AS-SET.
+            limit: Maximum number of snapshots to return.
+
+        Returns:
+            List of snapshot summaries, newest first.
+        """
+        cursor = self.conn.execute(
+            f"""
+            SELECT {_SUMMARY_COLUMNS}
+            FROM snapshots s
+            WHERE target = ?
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+            """,
+            (target, limit)
+        )
+        return [self._row_to_summary(row) for row in cursor.fetchall()]
+
+    @_locked
     def get_snapshot_by_id(self, snapshot_id: int) -> Optional[Snapshot]:
         """Get a snapshot by its ID."""
         cursor = self.conn.execute(
@@ -344,17 +549,33 @@ class SnapshotStore:
             target=row['target'],
             target_type=row['target_type'],
             timestamp=row['timestamp'],
-            irr_sources=json.loads(row['irr_sources']),
-            ipv4_prefixes=json.loads(row['ipv4_prefixes']),
-            ipv6_prefixes=json.loads(row['ipv6_prefixes']),
+            irr_sources=_json_loads(row['irr_sources']),
+            ipv4_prefixes=_json_loads(row['ipv4_prefixes']),
+            ipv6_prefixes=_json_loads(row['ipv6_prefixes']),
             content_hash=row['content_hash'],
             created_at=row['created_at'],
+            ipv4_count=row['ipv4_count'],
+            ipv6_count=row['ipv6_count'],
+        )
+
+    def _row_to_summary(self, row: sqlite3.Row) -> SnapshotSummary:
+        """Convert a row of _SUMMARY_COLUMNS to a SnapshotSummary object."""
+        return SnapshotSummary(
+            id=row['id'],
+            target=row['target'],
+            target_type=row['target_type'],
+            timestamp=row['timestamp'],
+            irr_sources=tuple(_json_loads(row['irr_sources'])),
+            ipv4_count=row['ipv4_count'],
+            ipv6_count=row['ipv6_count'],
+            content_hash=row['content_hash'],
         )
 
     # -------------------------------------------------------------------------
     # Diff operations
     # -------------------------------------------------------------------------
 
+    @_locked
     def save_diff(
         self,
         new_snapshot_id: int,
@@ -408,6 +629,7 @@ class SnapshotStore:
         self._commit_if_not_in_transaction()
         return cursor.lastrowid
 
+    @_locked
     def get_diff_by_hash(self, diff_hash: str) -> Optional[Diff]:
         """
         Get a diff by its hash.
@@ -425,6 +647,7 @@ class SnapshotStore:
         row = cursor.fetchone()
         return self._row_to_diff(row) if row else None
 
+    @_locked
     def get_diff_by_id(self, diff_id: int) -> Optional[Diff]:
         """Get a diff by its ID."""
         cursor = self.conn.execute(
@@ -434,6 +657,7 @@ class SnapshotStore:
         row = cursor.fetchone()
         return self._row_to_diff(row) if row else None
 
+    @_locked
     def get_diff_history(self, target: str, limit: int = 10) -> List[Diff]:
         """Get recent diffs for a target, newest first."""
         cursor = self.conn.execute(
@@ -447,6 +671,7 @@ class SnapshotStore:
         )
         return [self._row_to_diff(row) for row in cursor.fetchall()]
 
+    @_locked
     def get_latest_diff(self, target: str) -> Optional[Diff]:
         """Get the most recent diff for a target."""
         cursor = self.conn.execute(
@@ -468,10 +693,10 @@ class SnapshotStore:
             new_snapshot_id=row['new_snapshot_id'],
             old_snapshot_id=row['old_snapshot_id'],
             target=row['target'],
-            added_v4=json.loads(row['added_v4']),
-            removed_v4=json.loads(row['removed_v4']),
-            added_v6=json.loads(row['added_v6']),
-            removed_v6=json.loads(row['removed_v6']),
+            added_v4=tuple(_json_loads(row['added_v4'])),
+            removed_v4=tuple(_json_loads(row['removed_v4'])),
+            added_v6=tuple(_json_loads(row['added_v6'])),
+            removed_v6=tuple(_json_loads(row['removed_v6'])),
             diff_hash=row['diff_hash'],
             has_changes=bool(row['has_changes']),
             created_at=row['created_at'],
@@ -481,6 +706,7 @@ class SnapshotStore:
     # Ticket operations
     # -------------------------------------------------------------------------
 
+    @_locked
     def save_ticket(
         self,
         diff_id: int,
@@ -526,6 +752,7 @@ class SnapshotStore:
         self._commit_if_not_in_transaction()
         return cursor.lastrowid
 
+    @_locked
     def update_ticket_status(
         self,
         ticket_id: int,
@@ -559,6 +786,7 @@ class SnapshotStore:
         )
         self._commit_if_not_in_transaction()
 
+    @_locked
     def get_ticket_for_diff(self, diff_id: int) -> Optional[Ticket]:
         """
         Get the ticket associated with a diff.
@@ -581,6 +809,7 @@ class SnapshotStore:
         row = cursor.fetchone()
         return self._row_to_ticket(row) if row else None
 
+    @_locked
     def get_ticket_by_id(self, ticket_id: int) -> Optional[Ticket]:
         """Get a ticket by its ID."""
         cursor = self.conn.execute(
@@ -598,8 +827,8 @@ class SnapshotStore:
             target=row['target'],
             external_ticket_id=row['external_ticket_id'],
             status=row['status'],
-            request_payload=json.loads(row['request_payload']),
-            response_payload=json.loads(row['response_payload']) if row['response_payload'] else None,
+            request_payload=_json_loads(row['request_payload']),
+            response_payload=_json_loads(row['response_payload']) if row['response_payload'] else None,
             created_at=row['created_at'],
         )
 
@@ -607,6 +836,7 @@ class SnapshotStore:
     # Paginated list queries (for dashboard API)
     # -------------------------------------------------------------------------
 
+    @_locked
     def list_snapshots(
         self,
         page: int = 1,
@@ -628,6 +858,7 @@ class SnapshotStore:
         ).fetchall()
         return [self._row_to_snapshot(r) for r in rows], total
 
+    @_locked
     def list_diffs(
         self,
         page: int = 1,
@@ -649,6 +880,7 @@ class SnapshotStore:
         ).fetchall()
         return [self._row_to_diff(r) for r in rows], total
 
+    @_locked
     def list_tickets(
         self,
         page: int = 1,
@@ -670,12 +902,14 @@ class SnapshotStore:
         ).fetchall()
         return [self._row_to_ticket(r) for r in rows], total
 
+    @_locked
     def count_open_tickets(self) -> int:
         """Count tickets with status not in ('submitted', 'closed')."""
         return self.conn.execute(
             "SELECT COUNT(*) FROM tickets WHERE status NOT IN ('submitted', 'closed')"
         ).fetchone()[0]
 
+    @_locked
     def get_unique_targets(self) -> List[str]:
         """Return sorted list of unique targets that have snapshots."""
         rows = self.conn.execute(
@@ -683,12 +917,14 @@ class SnapshotStore:
         ).fetchall()
         return [r[0] for r in rows]
 
+    @_locked
     def count_unique_targets(self) -> int:
         """Return count of distinct targets in snapshots."""
         return self.conn.execute(
             "SELECT COUNT(DISTINCT target) FROM snapshots"
         ).fetchone()[0]
 
+    @_locked
     def get_latest_run_at(self) -> Optional[int]:
         """Return the most recent snapshot timestamp across all targets."""
         row = self.conn.execute(
@@ -696,6 +932,7 @@ class SnapshotStore:
         ).fetchone()
         return row[0] if row and row[0] else None
 
+    @_locked
     def count_recent_diffs(self, since_timestamp: int) -> int:
         """Count diffs created after the given Unix timestamp."""
         return self.conn.execute(
@@ -7,7 +7,7 @@ from typing import List, Optional
 
 import requests
 from tenacity import (
-    retry,
+    Retrying,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception_type,
@@ -69,6 +69,14 @@ class TicketingClient:
         self.api_token = api_token
         self.timeout = timeout
         self.max_retries = max_retries
+        # Built once rather than per submission.
+        self._retrying = Retrying(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_exponential(multiplier=1, min=2, max=30),
+            retry=retry_if_exception_type((requests.RequestException,)),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
+            reraise=True,
+        )
         self._session = requests.Session()
         self._session.headers.update({
             'Accept': 'application/json',
@@ -147,19 +155,8 @@ class TicketingClient:
 
     def _submit_ticket(self, payload: dict, diff_hash: str) -> TicketResponse:
         """Submit ticket with retry logic."""
-
-        @retry(
-            stop=stop_after_attempt(self.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=30),
-            retry=retry_if_exception_type((requests.RequestException,)),
-            before_sleep=before_sleep_log(logger, logging.WARNING),
-            reraise=True,
-        )
-        def _do_submit():
-            return self._execute_submit(payload, diff_hash)
-
         try:
-            return _do_submit()
+            return self._retrying(self._execute_submit, payload, diff_hash)
         except requests.RequestException as e:
             logger.error(
                 f"Failed to create ticket after {self.max_retries} attempts",
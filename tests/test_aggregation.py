@@ -7,6 +7,7 @@ AS-BYTEDANCE scenario:
         → 3 aggregated   (covered subnets removed)
 """
 
+import io
 import ipaddress
 import json
 import pytest
@@ -158,8 +159,8 @@ class TestASBytedanceAggregation:
         result = collapse_prefixes(data)
         assert len(result) == 3
 
-    @patch('subprocess.run')
-    def test_bgpq4_client_applies_aggregation(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_bgpq4_client_applies_aggregation(self, mock_popen):
         """BGPQ4Client.fetch_prefixes() applies collapse_prefixes() and records raw counts."""
         ipv4_data = _build_ipv4_bytedance()
         ipv6_data = _build_ipv6_bytedance()
@@ -167,10 +168,17 @@ class TestASBytedanceAggregation:
         v4_output = json.dumps({"pl": [{"prefix": p} for p in ipv4_data]})
         v6_output = json.dumps({"pl": [{"prefix": p} for p in ipv6_data]})
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        # IPv4/IPv6 queries run concurrently — answer by address family flag
+        def popen(cmd, **kwargs):
+            proc = MagicMock()
+            proc.stdout = io.BufferedReader(io.BytesIO(
+                (v6_output if "-6" in cmd else v4_output).encode()
+            ))
+            proc.stderr = io.BufferedReader(io.BytesIO(b""))
+            proc.wait.return_value = 0
+            return proc
+
+        mock_popen.side_effect = popen
 
         client = BGPQ4Client(sources=["RADB"], aggregate=False)
         result = client.fetch_prefixes("AS-BYTEDANCE")
@@ -183,10 +191,10 @@ class TestASBytedanceAggregation:
         assert len(result.ipv4_prefixes) == 10
         assert len(result.ipv6_prefixes) == 3
 
-    @patch('subprocess.run')
-    def test_prefix_result_raw_counts_default_zero(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_prefix_result_raw_counts_default_zero(self, mock_popen):
         """When queries fail, raw counts remain 0."""
-        mock_run.side_effect = FileNotFoundError("bgpq4 not found")
+        mock_popen.side_effect = FileNotFoundError("bgpq4 not found")
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS-BYTEDANCE")
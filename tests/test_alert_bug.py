@@ -183,8 +183,8 @@ class TestLookbackOffByOne:
 
         # FIXED: correctly detects no changes
         assert diff.has_changes is False
-        assert diff.added_v4 == []
-        assert diff.removed_v4 == []
+        assert diff.added_v4 == ()
+        assert diff.removed_v4 == ()
 
         store.close()
 
@@ -289,9 +289,8 @@ class TestCronEnvironmentWebhookMissing:
              patch("app.cli.TeamsNotifier") as MockNotifier:
 
             mock_store = Mock()
-            mock_store.save_snapshot.return_value = 1
             mock_store.get_snapshot_before.return_value = None
-            mock_store.get_snapshot_by_id.return_value = Snapshot(
+            mock_store.create_snapshot.return_value = Snapshot(
                 id=1, target="AS15169", target_type="asn",
                 timestamp=int(time.time()),
                 irr_sources=["RADB"],
@@ -329,9 +328,8 @@ class TestCronEnvironmentWebhookMissing:
             MockNotifier.return_value = mock_notifier
 
             mock_store = Mock()
-            mock_store.save_snapshot.return_value = 1
             mock_store.get_snapshot_before.return_value = None  # first run → has_changes
-            mock_store.get_snapshot_by_id.return_value = Snapshot(
+            mock_store.create_snapshot.return_value = Snapshot(
                 id=1, target="AS15169", target_type="asn",
                 timestamp=int(time.time()),
                 irr_sources=["RADB"],
@@ -442,9 +440,8 @@ class TestTeamsNotifySilentFailure:
             MockNotifier.return_value = mock_notifier
 
             mock_store = Mock()
-            mock_store.save_snapshot.return_value = 1
             mock_store.get_snapshot_before.return_value = None  # first run
-            mock_store.get_snapshot_by_id.return_value = Snapshot(
+            mock_store.create_snapshot.return_value = Snapshot(
                 id=1, target="AS15169", target_type="asn",
                 timestamp=int(time.time()),
                 irr_sources=["RADB"],
@@ -717,7 +714,7 @@ class TestEdgeCases:
         )
         diff = compute_diff(current, None)
         assert diff.has_changes is True
-        assert diff.added_v4 == ["8.8.8.0/24"]
+        assert diff.added_v4 == ("8.8.8.0/24",)
 
     def test_diff_with_identical_snapshots_no_changes(self):
         """Identical previous → no changes."""
@@ -809,9 +806,8 @@ class TestEdgeCases:
             MockNotifier.return_value = notifier_mock
 
             mock_store = Mock()
-            mock_store.save_snapshot.return_value = 1
             mock_store.get_snapshot_before.return_value = None
-            mock_store.get_snapshot_by_id.return_value = Snapshot(
+            mock_store.create_snapshot.return_value = Snapshot(
                 id=1, target="AS15169", target_type="asn",
                 timestamp=int(time.time()),
                 irr_sources=["RADB"],
@@ -1,11 +1,16 @@
 """Tests for the FastAPI application."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
+from api.concurrency import SingleFlight
 from api.main import app
-from app.bgpq4_client import PrefixResult
+from app.bgpq4_client import PrefixResult, TTLCache
 from app.store import SnapshotStore
 
 
@@ -13,6 +18,7 @@ from app.store import SnapshotStore
 def client():
     """Create a test client with a mock bgpq4 client injected into app state."""
     mock = MagicMock()
+    mock.cached_prefixes.return_value = None
     mock.fetch_prefixes.return_value = PrefixResult(
         ipv4_prefixes=set(),
         ipv6_prefixes=set(),
@@ -20,6 +26,8 @@ def client():
         errors=[],
     )
     app.state.bgpq4_client = mock
+    app.state.hot_responses = TTLCache(maxsize=16, ttl=300)
+    app.state.fetch_flights = SingleFlight()
     return TestClient(app)
 
 
@@ -42,6 +50,11 @@ class TestHealthEndpoint:
         assert "sources" in data
         assert isinstance(data["sources"], list)
 
+    def test_wildcard_cors_origin(self, client):
+        """Test the default "*" CORS setting allows any origin."""
+        response = client.get("/health", headers={"Origin": "https://example.com"})
+        assert response.headers["access-control-allow-origin"] == "*"
+
 
 class TestFetchEndpoint:
     """Tests for the /api/v1/fetch endpoint."""
@@ -68,6 +81,24 @@ class TestFetchEndpoint:
         assert data["ipv4_count"] == 2
         assert data["ipv6_count"] == 1
 
+    def test_fetch_response_is_json(self, client, mock_bgpq4_client):
+        """Test the serialized prefix response keeps the model's fields."""
+        mock_bgpq4_client.fetch_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=["1.0.0.0/8"],
+            ipv6_prefixes=[],
+            sources_queried=["RADB"],
+            errors=[]
+        )
+
+        response = client.post("/api/v1/fetch", json={"target": "AS15169"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["ipv4_prefixes"] == ["1.0.0.0/8"]
+        assert data["sources_queried"] == ["RADB"]
+        assert isinstance(data["query_time_ms"], int)
+
     def test_fetch_invalid_target(self, client):
         """Test fetch with invalid target format."""
         response = client.post(
@@ -136,6 +167,101 @@ class TestPrefixesGetEndpoint:
         assert data["ipv4_count"] == 1
         assert data["ipv6_count"] == 1
 
+    def test_get_prefixes_normalizes_target(self, client, mock_bgpq4_client):
+        """GET path parameter is upper-cased before querying."""
+        response = client.get("/api/v1/prefixes/as-google")
+
+        assert response.status_code != 422
+        mock_bgpq4_client.fetch_prefixes.assert_called_once_with("AS-GOOGLE")
+
+    def test_cached_target_skips_fetch(self, client, mock_bgpq4_client):
+        """Test a fully cached target is answered without calling fetch_prefixes."""
+        mock_bgpq4_client.cached_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=["8.8.8.0/24"],
+            sources_queried=["RADB"],
+        )
+
+        response = client.get("/api/v1/prefixes/AS15169")
+
+        assert response.status_code == 200
+        assert response.json()["ipv4_prefixes"] == ["8.8.8.0/24"]
+        mock_bgpq4_client.fetch_prefixes.assert_not_called()
+
+    def test_cached_target_reuses_serialized_body(self, client, mock_bgpq4_client):
+        """Test hot responses are reused until the client's cache entry changes."""
+        v4, v6 = ("8.8.8.0/24",), ()
+        mock_bgpq4_client.cached_prefixes.side_effect = lambda target: PrefixResult(
+            ipv4_prefixes=v4, ipv6_prefixes=v6, sources_queried=["RADB"],
+        )
+
+        first = client.get("/api/v1/prefixes/AS15169")
+        assert app.state.hot_responses.get("AS15169")[2] == first.content
+        with patch("api.main.PrefixResponse") as mock_model:
+            second = client.get("/api/v1/prefixes/AS15169")
+        mock_model.assert_not_called()
+        assert second.content == first.content
+
+        v4 = ("8.8.8.0/24", "8.8.4.0/24")
+        third = client.get("/api/v1/prefixes/AS15169")
+        assert third.json()["ipv4_count"] == 2
+
+    def test_get_prefixes_etag_revalidation(self, client, mock_bgpq4_client):
+        """Test a matching If-None-Match gets a bodiless 304."""
+        mock_bgpq4_client.fetch_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=["8.8.8.0/24"],
+            sources_queried=["RADB"],
+        )
+
+        first = client.get("/api/v1/prefixes/AS15169")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"].startswith("max-age=")
+
+        second = client.get("/api/v1/prefixes/AS15169", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+        mock_bgpq4_client.fetch_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=["8.8.4.0/24", "8.8.8.0/24"],
+            sources_queried=["RADB"],
+        )
+        third = client.get("/api/v1/prefixes/AS15169", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
+    def test_get_prefixes_if_modified_since(self, client, mock_bgpq4_client):
+        """Test Last-Modified comes from the fetch time and If-Modified-Since revalidates."""
+        mock_bgpq4_client.fetch_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=["8.8.8.0/24"],
+            sources_queried=["RADB"],
+            fetched_at=1700000000.5,
+        )
+
+        first = client.get("/api/v1/prefixes/AS15169")
+        last_modified = first.headers["last-modified"]
+        assert last_modified == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+        second = client.get("/api/v1/prefixes/AS15169", headers={"If-Modified-Since": last_modified})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["last-modified"] == last_modified
+
+        earlier = client.get(
+            "/api/v1/prefixes/AS15169",
+            headers={"If-Modified-Since": "Tue, 14 Nov 2023 22:13:19 GMT"},
+        )
+        assert earlier.status_code == 200
+
+        garbage = client.get("/api/v1/prefixes/AS15169", headers={"If-Modified-Since": "yesterday"})
+        assert garbage.status_code == 200
+
+        # If-None-Match wins over If-Modified-Since when both are sent.
+        both = client.get(
+            "/api/v1/prefixes/AS15169",
+            headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified},
+        )
+        assert both.status_code == 200
+
     def test_get_prefixes_invalid_target(self, client):
         """Test GET endpoint with invalid target."""
         response = client.get("/api/v1/prefixes/INVALID_TARGET")
@@ -150,6 +276,82 @@ class TestPrefixesGetEndpoint:
         assert response.status_code in [200, 502, 500]
 
 
+class TestSingleFlight:
+    """Tests for coalescing concurrent duplicate fetches."""
+
+    def test_concurrent_duplicates_share_one_call(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch(target):
+            calls.append(target)
+            release.wait(5)
+            return f"result-{target}"
+
+        async def scenario():
+            flights = SingleFlight()
+            tasks = [asyncio.create_task(flights.do("AS1", slow_fetch, "AS1")) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            assert len(flights) == 1
+            release.set()
+            results = await asyncio.gather(*tasks)
+            assert len(flights) == 0
+            return results
+
+        results = asyncio.run(scenario())
+
+        assert calls == ["AS1"]
+        assert results == ["result-AS1"] * 5
+
+    def test_distinct_keys_run_separately(self):
+        async def scenario():
+            flights = SingleFlight()
+            return await asyncio.gather(
+                flights.do("AS1", str.lower, "AS1"),
+                flights.do("AS2", str.lower, "AS2"),
+            )
+
+        assert asyncio.run(scenario()) == ["as1", "as2"]
+
+    def test_executor_bounds_concurrency(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def fetch(target):
+            with lock:
+                running.append(target)
+                peak.append(len(running))
+            threading.Event().wait(0.02)
+            with lock:
+                running.remove(target)
+            return target
+
+        async def scenario():
+            flights = SingleFlight(executor=ThreadPoolExecutor(max_workers=2))
+            return await asyncio.gather(
+                *(flights.do(f"AS{i}", fetch, f"AS{i}") for i in range(6))
+            )
+
+        assert asyncio.run(scenario()) == [f"AS{i}" for i in range(6)]
+        assert max(peak) <= 2
+
+    def test_errors_propagate_to_all_waiters(self):
+        def boom(target):
+            raise RuntimeError("bgpq4 failed")
+
+        async def scenario():
+            flights = SingleFlight()
+            return await asyncio.gather(
+                flights.do("AS1", boom, "AS1"),
+                flights.do("AS1", boom, "AS1"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
 class TestTargetValidation:
     """Tests for target validation in request models."""
 
@@ -196,6 +398,7 @@ class TestTargetValidation:
             "15169",  # Just number
             "",  # Empty
             "AS-",  # Incomplete AS-SET
+            "AS\u00b2",  # Superscript digit passes str.isdigit() but is not an ASN
         ]
 
         for target in invalid_targets:
@@ -215,6 +418,10 @@ def test_client():
         mock_settings.bgpq4_timeout = 10
         mock_settings.bgpq4_sources_list = ["RADB"]
         mock_settings.bgpq4_aggregate = True
+        mock_settings.bgpq4_persistent = False
+        mock_settings.bgpq4_cache_ttl = 300
+        mock_settings.bgpq4_cache_size = 128
+        mock_settings.max_concurrent_queries = 4
         mock_settings.log_level = "INFO"
         mock_settings.cors_origins = "*"
         mock_settings.db_path = ":memory:"
@@ -222,6 +429,76 @@ def test_client():
             yield tc
 
 
+def test_run_skips_prefix_cache(tmp_path):
+    """POST /api/v1/run queries bgpq4 again even when the target is cached."""
+    import io
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("targets:\n  - AS15169\n")
+    commands = []
+
+    def popen(cmd, **kwargs):
+        commands.append(cmd)
+        proc = MagicMock()
+        proc.stdout = io.BufferedReader(io.BytesIO(b'{"pl": [{"prefix": "8.8.8.0/24"}]}'))
+        proc.stderr = io.BufferedReader(io.BytesIO(b''))
+        proc.wait.return_value = 0
+        return proc
+
+    with patch("api.main.settings") as mock_settings, \
+            patch("subprocess.Popen", side_effect=popen):
+        mock_settings.bgpq4_cmd_list = ["bgpq4"]
+        mock_settings.bgpq4_timeout = 10
+        mock_settings.bgpq4_sources_list = ["RADB"]
+        mock_settings.bgpq4_aggregate = True
+        mock_settings.bgpq4_cache_ttl = 300
+        mock_settings.bgpq4_cache_size = 16
+        mock_settings.bgpq4_persistent = False
+        mock_settings.max_concurrent_queries = 4
+        mock_settings.log_level = "INFO"
+        mock_settings.db_path = ":memory:"
+        mock_settings.config_path = str(config_path)
+        with TestClient(app) as tc:
+            assert tc.get("/api/v1/prefixes/AS15169").status_code == 200
+            assert len(commands) == 2  # one per address family, now cached
+
+            for runs in (1, 2):
+                response = tc.post("/api/v1/run")
+                assert response.json()["targets_processed"] == 1
+                assert len(commands) == 2 + 2 * runs
+
+            # The run's fresh result refilled the cache for lookups.
+            assert tc.get("/api/v1/prefixes/AS15169").status_code == 200
+            assert len(commands) == 6
+
+
+def test_hot_responses_scoped_to_app_lifetime(test_client):
+    """Each startup gets its own response cache, sized and aged like the client's."""
+    hot = test_client.app.state.hot_responses
+    assert isinstance(hot, TTLCache)
+    assert len(hot) == 0
+    assert (hot.maxsize, hot.ttl) == (128, 300)
+
+
+def test_fetch_pool_shut_down_with_app():
+    """Each startup gets its own fetch pool, shut down when the app stops."""
+    pools = []
+    with patch("api.main.settings") as mock_settings:
+        mock_settings.bgpq4_cmd_list = ["echo"]
+        mock_settings.bgpq4_sources_list = ["RADB"]
+        mock_settings.bgpq4_persistent = False
+        mock_settings.max_concurrent_queries = 2
+        mock_settings.log_level = "INFO"
+        mock_settings.db_path = ":memory:"
+        for _ in range(2):
+            with TestClient(app):
+                pools.append(app.state.fetch_flights._executor)
+
+    assert pools[0] is not pools[1]
+    for pool in pools:
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+
+
 def test_store_available_in_app_state(test_client):
     """app.state.store is a live SnapshotStore after startup."""
     assert hasattr(test_client.app.state, "store")
@@ -239,6 +516,22 @@ def test_list_targets_empty(test_client):
     assert response.json() == []
 
 
+def test_list_targets_summary(test_client):
+    """GET /api/v1/targets/summary reports counts without loading prefix lists."""
+    test_client.app.state.store.save_snapshot(
+        "AS15169", "asn", ["RADB"], ["8.8.8.0/24", "8.8.4.0/24"], ["2001:4860::/32"],
+    )
+    response = test_client.get("/api/v1/targets/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    summary = data["targets"][0]
+    assert summary["target"] == "AS15169"
+    assert summary["target_type"] == "asn"
+    assert (summary["ipv4_count"], summary["ipv6_count"]) == (2, 1)
+    assert summary["sources"] == ["RADB"]
+
+
 
 def test_get_overview_empty(test_client):
     """GET /api/v1/overview returns correct schema on an empty store."""
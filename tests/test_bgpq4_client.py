@@ -1,7 +1,9 @@
 """Tests for the BGPQ4 IRR client."""
 
+import io
 import json
-import subprocess
+import sys
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -10,9 +12,41 @@ from app.bgpq4_client import (
     BGPQ4ClientError,
     BGPQ4NotFoundError,
     PrefixResult,
+    _BGPQ4Helper,
 )
 
 
+def _fake_proc(stdout=b"", stderr=b"", returncode=0):
+    """Stand-in for a finished bgpq4 Popen object with the given output."""
+    if isinstance(stdout, str):
+        stdout = stdout.encode()
+    proc = MagicMock()
+    proc.stdout = io.BufferedReader(io.BytesIO(stdout))
+    proc.stderr = io.BufferedReader(io.BytesIO(stderr))
+    proc.wait.return_value = returncode
+    proc.returncode = returncode
+    return proc
+
+
+def _popen(stdout=b"", stderr=b"", returncode=0):
+    """subprocess.Popen side effect returning a fresh fake process per call."""
+    return lambda cmd, **kwargs: _fake_proc(stdout, stderr, returncode)
+
+
+def _by_family(v4, v6):
+    """subprocess.Popen side effect answering by address family.
+
+    IPv4 and IPv6 queries run concurrently, so call order is not fixed.
+    Each argument is either stdout text or a prepared _fake_proc().
+    """
+    def popen(cmd, **kwargs):
+        outcome = v6 if "-6" in cmd else v4
+        if isinstance(outcome, (str, bytes)):
+            return _fake_proc(outcome)
+        return outcome
+    return popen
+
+
 class TestBGPQ4Client:
     """Tests for BGPQ4Client."""
 
@@ -45,8 +79,8 @@ class TestBGPQ4Client:
         with pytest.raises(ValueError, match="sources must not be empty"):
             BGPQ4Client(sources=[])
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_ipv4(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_ipv4(self, mock_popen):
         v4_output = json.dumps({
             "pl": [
                 {"prefix": "8.8.8.0/24", "exact": True},
@@ -55,21 +89,18 @@ class TestBGPQ4Client:
         })
         v6_output = json.dumps({"pl": []})
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        mock_popen.side_effect = _by_family(v4_output, v6_output)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
-        assert result.ipv4_prefixes == {"8.8.8.0/24", "8.8.4.0/24"}
-        assert result.ipv6_prefixes == set()
+        assert result.ipv4_prefixes == ("8.8.4.0/24", "8.8.8.0/24")
+        assert result.ipv6_prefixes == ()
         assert result.sources_queried == ["RADB"]
         assert result.errors == []
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_ipv6(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_ipv6(self, mock_popen):
         v4_output = json.dumps({"pl": []})
         v6_output = json.dumps({
             "pl": [
@@ -78,19 +109,16 @@ class TestBGPQ4Client:
             ]
         })
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        mock_popen.side_effect = _by_family(v4_output, v6_output)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
-        assert result.ipv4_prefixes == set()
-        assert result.ipv6_prefixes == {"2001:4860::/32", "2607:f8b0::/32"}
+        assert result.ipv4_prefixes == ()
+        assert result.ipv6_prefixes == ("2001:4860::/32", "2607:f8b0::/32")
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_mixed(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_mixed(self, mock_popen):
         v4_output = json.dumps({
             "pl": [{"prefix": "8.8.8.0/24", "exact": True}]
         })
@@ -98,69 +126,75 @@ class TestBGPQ4Client:
             "pl": [{"prefix": "2001:4860::/32", "exact": True}]
         })
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        mock_popen.side_effect = _by_family(v4_output, v6_output)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
-        assert result.ipv4_prefixes == {"8.8.8.0/24"}
-        assert result.ipv6_prefixes == {"2001:4860::/32"}
+        assert result.ipv4_prefixes == ("8.8.8.0/24",)
+        assert result.ipv6_prefixes == ("2001:4860::/32",)
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_timeout(self, mock_run):
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="wsl", timeout=120)
-
-        client = BGPQ4Client()
+    def test_fetch_prefixes_timeout(self):
+        """A bgpq4 that outlives the timeout is killed and reported as failed."""
+        hang = [sys.executable, "-c", "import time; time.sleep(30)"]
+        client = BGPQ4Client(bgpq4_cmd=hang, timeout=0.2)
         result = client.fetch_prefixes("AS15169")
 
-        assert result.ipv4_prefixes == set()
-        assert result.ipv6_prefixes == set()
+        assert result.ipv4_prefixes == ()
+        assert result.ipv6_prefixes == ()
         assert len(result.errors) == 2  # Both IPv4 and IPv6 fail
+        assert all("timed out" in e for e in result.errors)
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_not_found(self, mock_run):
-        mock_run.side_effect = FileNotFoundError("wsl not found")
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_not_found(self, mock_popen):
+        mock_popen.side_effect = FileNotFoundError("wsl not found")
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
         assert len(result.errors) == 2
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_nonzero_exit(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=1, stdout="", stderr="Error: no objects found"
-        )
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_nonzero_exit(self, mock_popen):
+        mock_popen.side_effect = _popen(b"", b"Error: no objects found", returncode=1)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
         assert len(result.errors) == 2
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_partial_failure(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_partial_failure(self, mock_popen):
         """IPv4 succeeds but IPv6 fails."""
         v4_output = json.dumps({
             "pl": [{"prefix": "8.8.8.0/24", "exact": True}]
         })
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            subprocess.TimeoutExpired(cmd="wsl", timeout=120),
-        ]
+        mock_popen.side_effect = _by_family(
+            v4_output, _fake_proc(stderr=b"connection reset", returncode=1)
+        )
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS15169")
 
-        assert result.ipv4_prefixes == {"8.8.8.0/24"}
-        assert result.ipv6_prefixes == set()
+        assert result.ipv4_prefixes == ("8.8.8.0/24",)
+        assert result.ipv6_prefixes == ()
         assert len(result.errors) == 1  # Only IPv6 failed
 
-    @patch('subprocess.run')
-    def test_as_set_support(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_prefixes_returned_in_numeric_order(self, mock_popen):
+        """Aggregated prefixes come back sorted by address, not as strings."""
+        v4_output = json.dumps({"pl": [
+            {"prefix": "10.0.0.0/8"}, {"prefix": "9.0.0.0/8"}, {"prefix": "2.0.0.0/8"},
+        ]})
+        mock_popen.side_effect = _by_family(v4_output, '{"pl": []}')
+
+        result = BGPQ4Client().fetch_prefixes("AS15169")
+
+        assert result.ipv4_prefixes == ("2.0.0.0/8", "9.0.0.0/8", "10.0.0.0/8")
+
+    @patch('subprocess.Popen')
+    def test_as_set_support(self, mock_popen):
         """Test that AS-SET targets work."""
         v4_output = json.dumps({
             "pl": [
@@ -170,27 +204,22 @@ class TestBGPQ4Client:
         })
         v6_output = json.dumps({"pl": []})
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        mock_popen.side_effect = _by_family(v4_output, v6_output)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("AS-GOOGLE")
 
-        assert result.ipv4_prefixes == {"10.0.0.0/8", "172.16.0.0/12"}
+        assert result.ipv4_prefixes == ("10.0.0.0/8", "172.16.0.0/12")
 
-    @patch('subprocess.run')
-    def test_command_flags_ipv4(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_command_flags_ipv4(self, mock_popen):
         """Verify correct flags for IPv4 — aggregation is Python-side, no -A flag."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client(sources=["RADB"], aggregate=True)
         client._run_bgpq4("AS15169", ipv6=False)
 
-        cmd = mock_run.call_args[0][0]
+        cmd = mock_popen.call_args[0][0]
         assert cmd[0:2] == ["wsl", "bgpq4"]
         assert "-4" in cmd
         assert "-j" in cmd
@@ -200,90 +229,295 @@ class TestBGPQ4Client:
         assert cmd[idx + 1] == "RADB"
         assert "AS15169" in cmd
 
-    @patch('subprocess.run')
-    def test_command_flags_multiple_sources(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_command_flags_multiple_sources(self, mock_popen):
         """Verify multiple sources are joined with comma in -S flag."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client(sources=["RADB", "RPKI"])
         client._run_bgpq4("AS15169", ipv6=False)
 
-        cmd = mock_run.call_args[0][0]
+        cmd = mock_popen.call_args[0][0]
         idx = cmd.index("-S")
         assert cmd[idx + 1] == "RADB,RPKI"
 
-    @patch('subprocess.run')
-    def test_fetch_prefixes_multi_source_stored(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_fetch_prefixes_multi_source_stored(self, mock_popen):
         """Verify sources_queried contains all configured sources."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client(sources=["RADB", "RIPE", "RPKI"])
         result = client.fetch_prefixes("AS15169")
 
         assert result.sources_queried == ["RADB", "RIPE", "RPKI"]
 
-    @patch('subprocess.run')
-    def test_command_flags_ipv6(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_command_flags_ipv6(self, mock_popen):
         """Verify correct flags for IPv6."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client()
         client._run_bgpq4("AS-GOOGLE", ipv6=True)
 
-        cmd = mock_run.call_args[0][0]
+        cmd = mock_popen.call_args[0][0]
         assert "-6" in cmd
         assert "-4" not in cmd
         assert "AS-GOOGLE" in cmd
 
-    @patch('subprocess.run')
-    def test_command_flags_no_aggregation_flag(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_command_flags_no_aggregation_flag(self, mock_popen):
         """Verify -A is never passed — aggregation is always Python-side."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client(aggregate=False)
         client._run_bgpq4("AS15169", ipv6=False)
 
-        cmd = mock_run.call_args[0][0]
+        cmd = mock_popen.call_args[0][0]
         assert "-A" not in cmd
 
-    @patch('subprocess.run')
-    def test_command_custom_cmd(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_command_custom_cmd(self, mock_popen):
         """Verify custom bgpq4_cmd is used."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout='{"pl": []}', stderr=""
-        )
+        mock_popen.side_effect = _popen('{"pl": []}')
 
         client = BGPQ4Client(bgpq4_cmd=["/usr/local/bin/bgpq4"])
         client._run_bgpq4("AS15169", ipv6=False)
 
-        cmd = mock_run.call_args[0][0]
+        cmd = mock_popen.call_args[0][0]
         assert cmd[0] == "/usr/local/bin/bgpq4"
 
-    @patch('subprocess.run')
-    def test_target_normalized_to_uppercase(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_target_normalized_to_uppercase(self, mock_popen):
         """Test that target is normalized to uppercase."""
         v4_output = json.dumps({"pl": [{"prefix": "8.8.8.0/24", "exact": True}]})
         v6_output = json.dumps({"pl": []})
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=v4_output, stderr=""),
-            MagicMock(returncode=0, stdout=v6_output, stderr=""),
-        ]
+        mock_popen.side_effect = _by_family(v4_output, v6_output)
 
         client = BGPQ4Client()
         result = client.fetch_prefixes("as15169")
 
         # Check the command used uppercase target
-        first_call_cmd = mock_run.call_args_list[0][0][0]
-        assert "AS15169" in first_call_cmd
+        for call in mock_popen.call_args_list:
+            assert "AS15169" in call[0][0]
+
+
+class TestConcurrentFetches:
+    """Tests for running bgpq4 lookups from several threads at once."""
+
+    @patch('subprocess.Popen')
+    def test_concurrent_fetches_overlap(self, mock_popen):
+        """Test every caller's IPv4 and IPv6 subprocesses run at the same time."""
+        callers = 4
+        # Only releases once all 2 * callers subprocesses have been started.
+        barrier = threading.Barrier(2 * callers, timeout=5)
+
+        def popen(cmd, **kwargs):
+            barrier.wait()
+            return _fake_proc('{"pl": [{"prefix": "8.8.8.0/24"}]}')
+
+        mock_popen.side_effect = popen
+        client = BGPQ4Client(cache_ttl=0)
+        results = [None] * callers
+
+        def fetch(i):
+            results[i] = client.fetch_prefixes(f"AS{i + 1}")
+
+        threads = [threading.Thread(target=fetch, args=(i,)) for i in range(callers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        assert all(r is not None and not r.errors for r in results)
+        assert mock_popen.call_count == 2 * callers
+
+
+class TestResultCache:
+    """Tests for the in-memory TTL cache around bgpq4 invocations."""
+
+    @patch('subprocess.Popen')
+    def test_repeat_query_served_from_cache(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": [{"prefix": "8.8.8.0/24"}]}')
+
+        client = BGPQ4Client()
+        first = client.fetch_prefixes("AS15169")
+        second = client.fetch_prefixes("as15169")
+
+        assert mock_popen.call_count == 2  # one per address family, not per call
+        assert first.ipv4_prefixes == second.ipv4_prefixes == ("8.8.8.0/24",)
+
+    @patch('subprocess.Popen')
+    def test_fetch_bypassing_cache_refreshes_it(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": [{"prefix": "8.8.8.0/24"}]}')
+
+        client = BGPQ4Client()
+        client.fetch_prefixes("AS15169")
+        mock_popen.side_effect = _popen('{"pl": [{"prefix": "8.8.4.0/24"}]}')
+        fresh = client.fetch_prefixes("AS15169", use_cache=False)
+
+        assert mock_popen.call_count == 4
+        assert fresh.ipv4_prefixes == ("8.8.4.0/24",)
+        assert client.cached_prefixes("AS15169").ipv4_prefixes == ("8.8.4.0/24",)
+
+    @patch('subprocess.Popen')
+    def test_cached_prefixes(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": [{"prefix": "8.8.8.0/24"}]}')
+
+        client = BGPQ4Client()
+        assert client.cached_prefixes("AS15169") is None
+
+        fetched = client.fetch_prefixes("AS15169")
+        cached = client.cached_prefixes(" as15169 ")
+
+        assert mock_popen.call_count == 2
+        assert cached.ipv4_prefixes == ("8.8.8.0/24",)
+        assert cached.ipv4_raw_count == 1
+        assert cached.errors == []
+        # The cache entries predate the end of the fetch that stored them.
+        assert cached.fetched_at <= fetched.fetched_at
+        assert client.cached_prefixes("AS15169").fetched_at == cached.fetched_at
+
+    @patch('subprocess.Popen')
+    def test_cache_disabled_with_zero_ttl(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": []}')
+
+        client = BGPQ4Client(cache_ttl=0)
+        client.fetch_prefixes("AS15169")
+        client.fetch_prefixes("AS15169")
+
+        assert mock_popen.call_count == 4
+
+    @patch('subprocess.Popen')
+    def test_failures_are_not_cached(self, mock_popen):
+        mock_popen.side_effect = [
+            _fake_proc(stderr=b"connection reset", returncode=1),
+            _fake_proc('{"pl": [{"prefix": "8.8.8.0/24"}]}'),
+        ]
+
+        client = BGPQ4Client()
+        with pytest.raises(BGPQ4ClientError):
+            client._query_family("AS15169", ipv6=False)
+        assert client._query_family("AS15169", ipv6=False) == (1, ("8.8.8.0/24",))
+
+    @patch('subprocess.Popen')
+    def test_prefix_strings_shared_across_targets(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": [{"prefix": "8.8.8.0/24"}]}')
+
+        client = BGPQ4Client()
+        _, (a,) = client._query_family("AS15169", ipv6=False)
+        _, (b,) = client._query_family("AS-GOOGLE", ipv6=False)
+
+        assert a is b
+
+    @patch('subprocess.Popen')
+    def test_expired_entry_is_refetched(self, mock_popen):
+        mock_popen.side_effect = _popen('{"pl": []}')
+
+        client = BGPQ4Client(cache_ttl=60)
+        with patch('app.bgpq4_client.time.monotonic', return_value=1000.0):
+            client._query_family("AS15169", ipv6=False)
+        with patch('app.bgpq4_client.time.monotonic', return_value=1030.0):
+            client._query_family("AS15169", ipv6=False)  # still fresh
+        with patch('app.bgpq4_client.time.monotonic', return_value=1061.0):
+            client._query_family("AS15169", ipv6=False)
+
+        assert mock_popen.call_count == 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="helper needs a POSIX shell")
+class TestPersistentHelper:
+    """Tests for persistent mode, driving a fake bgpq4 script through the helper shell."""
+
+    @pytest.fixture
+    def fake_bgpq4(self, tmp_path):
+        script = tmp_path / "bgpq4"
+        script.write_text(
+            "#!/bin/sh\n"
+            'case "$*" in *AS666*) echo "no such object" >&2; exit 1;; esac\n'
+            'case "$*" in *AS999*) sleep 30;; esac\n'
+            'if [ "$1" = "-6" ]; then echo \'{"pl": []}\'; '
+            'else echo \'{"pl": [{"prefix": "10.0.0.0/8"}]}\'; fi\n'
+        )
+        script.chmod(0o755)
+        return [str(script)]
+
+    def test_queries_reuse_one_helper(self, fake_bgpq4):
+        with BGPQ4Client(bgpq4_cmd=fake_bgpq4, persistent=True, cache_ttl=0) as client:
+            first = client.fetch_prefixes("AS15169")
+            pid = client._helpers[False]._proc.pid
+            second = client.fetch_prefixes("AS-GOOGLE")
+
+            assert first.ipv4_prefixes == second.ipv4_prefixes == ("10.0.0.0/8",)
+            assert first.ipv6_prefixes == ()
+            assert client._helpers[False]._proc.pid == pid
+
+    def test_nonzero_exit_keeps_helper(self, fake_bgpq4):
+        with BGPQ4Client(bgpq4_cmd=fake_bgpq4, persistent=True) as client:
+            result = client.fetch_prefixes("AS666")
+            assert result.errors[0] == "IPv4 query failed: bgpq4 exited with code 1: no such object"
+            assert client.fetch_prefixes("AS15169").ipv4_prefixes == ("10.0.0.0/8",)
+
+    def test_timeout_respawns_helper(self, fake_bgpq4):
+        with BGPQ4Client(bgpq4_cmd=fake_bgpq4, persistent=True, timeout=0.5) as client:
+            helper = client._helpers[False]
+            assert client._run_bgpq4("AS15169") == {"10.0.0.0/8"}
+            old_pgid = helper._pgid
+            assert old_pgid == helper._proc.pid
+
+            with pytest.raises(BGPQ4ClientError, match="timed out after 0.5s for AS999"):
+                client._run_bgpq4("AS999")
+            assert helper._proc is None
+            # The hung bgpq4 went down with the shell, not just the shell.
+            assert not _group_alive(old_pgid)
+
+            assert client._run_bgpq4("AS15169") == {"10.0.0.0/8"}
+            assert helper._pgid not in (None, old_pgid)
+
+
+def _group_alive(pgid, wait=2.0):
+    """Whether any non-zombie process is still in process group pgid."""
+    import os
+    import time
+    if not os.path.isdir("/proc/self"):
+        pytest.skip("needs /proc")
+    deadline = time.monotonic() + wait
+    while True:
+        alive = False
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if fields[0] != "Z" and int(fields[2]) == pgid:
+                alive = True
+                break
+        if not alive or time.monotonic() > deadline:
+            return alive
+        time.sleep(0.05)
+
+
+class TestHelperUnderWSL:
+    """Tests for the WSL-specific helper launch and kill commands."""
+
+    @patch('subprocess.Popen')
+    def test_spawn_runs_under_setsid(self, mock_popen):
+        helper = _BGPQ4Helper(["wsl", "bgpq4"], timeout=5)
+        helper._spawn()
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[:6] == ["wsl", "--exec", "setsid", "--wait", "sh", "-c"]
+        assert cmd[-1] == "bgpq4"
+
+    @patch('subprocess.run')
+    def test_kill_reaches_linux_process_group(self, mock_run):
+        helper = _BGPQ4Helper(["wsl", "bgpq4"], timeout=5)
+        helper._pgid = 4242
+        proc = MagicMock()
+        with patch('app.bgpq4_client.os.name', 'nt'):
+            helper._kill(proc)
+        assert mock_run.call_args[0][0] == ["wsl", "--exec", "kill", "-KILL", "--", "-4242"]
+        proc.kill.assert_called_once()
 
 
 class TestParseJsonOutput:
@@ -325,6 +559,59 @@ class TestParseJsonOutput:
         with pytest.raises(BGPQ4ClientError, match="Failed to parse"):
             client._parse_json_output("not valid json")
 
+    @patch('subprocess.Popen')
+    def test_unparseable_output_reported(self, mock_popen):
+        mock_popen.side_effect = _popen("not valid json")
+
+        client = BGPQ4Client()
+        with pytest.raises(BGPQ4ClientError, match="Failed to parse"):
+            client._run_bgpq4("AS15169", ipv6=False)
+
+    @patch('subprocess.Popen')
+    def test_nonzero_exit_wins_over_parse_error(self, mock_popen):
+        mock_popen.side_effect = _popen("garbage", b"query failed", returncode=2)
+
+        client = BGPQ4Client()
+        with pytest.raises(BGPQ4ClientError, match="exited with code 2: query failed"):
+            client._run_bgpq4("AS15169", ipv6=False)
+
+    def test_parse_large_stream_with_ijson(self):
+        pytest.importorskip("ijson")
+        client = BGPQ4Client()
+        stream = io.BufferedReader(io.BytesIO(
+            b'{"pl": [{"prefix": "8.8.8.0/24", "exact": true}, {"exact": true},'
+            b' {"prefix": "8.8.4.0/24"}]}'
+        ))
+        with patch('app.bgpq4_client._STREAM_PARSE_THRESHOLD', 16), \
+                patch.object(client, '_parse_json_output') as one_pass:
+            result = client._parse_json_stream(stream)
+        one_pass.assert_not_called()
+        assert result == {"8.8.8.0/24", "8.8.4.0/24"}
+
+    def test_parse_large_stream_invalid_json(self):
+        pytest.importorskip("ijson")
+        client = BGPQ4Client()
+        stream = io.BufferedReader(io.BytesIO(b'{"pl": [{"prefix": "8.8.8.0/24"}, garbage'))
+        with patch('app.bgpq4_client._STREAM_PARSE_THRESHOLD', 16):
+            with pytest.raises(BGPQ4ClientError, match="Failed to parse"):
+                client._parse_json_stream(stream)
+
+    def test_parse_small_stream_in_one_pass(self):
+        client = BGPQ4Client()
+        stream = io.BufferedReader(io.BytesIO(b'{"pl": [{"prefix": "8.8.8.0/24"}]}'))
+        with patch('app.bgpq4_client.ijson') as mock_ijson:
+            assert client._parse_json_stream(stream) == {"8.8.8.0/24"}
+        mock_ijson.items.assert_not_called()
+
+    def test_parse_stream_empty(self):
+        client = BGPQ4Client()
+        assert client._parse_json_stream(io.BufferedReader(io.BytesIO(b""))) == set()
+
+    def test_parse_bytes_output(self):
+        client = BGPQ4Client()
+        result = client._parse_json_output(b'{"pl": [{"prefix": "8.8.8.0/24"}]}')
+        assert result == {"8.8.8.0/24"}
+
     def test_parse_entries_without_prefix(self):
         client = BGPQ4Client()
         output = json.dumps({
@@ -343,11 +630,15 @@ class TestPrefixResult:
 
     def test_default_values(self):
         result = PrefixResult()
-        assert result.ipv4_prefixes == set()
-        assert result.ipv6_prefixes == set()
+        assert result.ipv4_prefixes == ()
+        assert result.ipv6_prefixes == ()
         assert result.sources_queried == []
         assert result.errors == []
 
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            PrefixResult().extra = 1
+
     def test_custom_values(self):
         result = PrefixResult(
             ipv4_prefixes={"1.0.0.0/8"},
@@ -372,3 +663,20 @@ class TestClientContextManager:
     def test_close_is_noop(self):
         client = BGPQ4Client()
         client.close()  # Should not raise
+
+    @patch('subprocess.Popen')
+    def test_ipv4_and_ipv6_queries_run_concurrently(self, mock_popen):
+        """Both address families are in flight at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def run(cmd, **kwargs):
+            barrier.wait()  # Deadlocks (and times out) if queries are serial
+            return _fake_proc('{"pl": []}')
+
+        mock_popen.side_effect = run
+
+        client = BGPQ4Client()
+        result = client.fetch_prefixes("AS15169")
+
+        assert result.errors == []
+        assert mock_popen.call_count == 2
@@ -20,6 +20,7 @@ from app.cli import (
     get_timestamp_str,
     print_output,
     detect_target_type,
+    _intern_target,
 )
 from app.config import Config, BGPQ4Config, DatabaseConfig, TicketingConfig, LoggingConfig, DiffConfig
 from app.store import Snapshot, Diff, Ticket
@@ -102,6 +103,16 @@ class TestDetectTargetType:
         assert detect_target_type('AS-SET-NAME') == 'as-set'
 
 
+class TestInternTarget:
+    """Tests for _intern_target helper."""
+
+    def test_uppercases_and_interns(self):
+        first = _intern_target('as-google')
+        second = _intern_target(''.join(['As-', 'Google']))
+        assert first == 'AS-GOOGLE'
+        assert first is second
+
+
 class TestCreateParser:
     """Tests for argument parser creation."""
 
@@ -145,6 +156,35 @@ class TestCreateParser:
         args = parser.parse_args(['submit', '--target', 'AS15169', '--dry-run'])
         assert args.dry_run is True
 
+    def test_fresh_parser_applies_history_defaults(self):
+        """Test omitted history options get their defaults on a fresh parser."""
+        args = create_parser().parse_args(['history'])
+        assert args.limit == 10
+        assert args.target is None
+
+    @pytest.mark.parametrize('argv', [
+        ['run-all'],
+        ['run', '-t', 'AS1'],
+        ['submit', '-t', 'AS1'],
+    ])
+    def test_fresh_parser_applies_dry_run_default(self, argv):
+        """Test --dry-run defaults to False when omitted on a fresh parser."""
+        args = create_parser().parse_args(argv)
+        assert args.dry_run is False
+
+    def test_only_selected_subparser_is_built(self):
+        """Test subcommand arguments are added only for the chosen command."""
+        parser = create_parser()
+        subparsers = next(
+            a for a in parser._actions if isinstance(a, argparse._SubParsersAction)
+        )
+        parser.parse_args(['history', '--limit', '5'])
+
+        built = {
+            name for name, sub in subparsers.choices.items() if sub._builder is None
+        }
+        assert built == {'history'}
+
 
 class TestCmdInitDb:
     """Tests for init-db command."""
@@ -194,15 +234,14 @@ class TestCmdFetch:
         mock_client_class.return_value = mock_client
 
         mock_store = Mock()
-        mock_store.save_snapshot.return_value = 1
-        mock_store.get_snapshot_by_id.return_value = mock_snapshot
+        mock_store.create_snapshot.return_value = mock_snapshot
         mock_store_class.return_value = mock_store
 
         result = cmd_fetch(mock_config, mock_args)
 
         assert result == 0
         mock_client.fetch_prefixes.assert_called_once_with('AS15169')
-        mock_store.save_snapshot.assert_called_once()
+        mock_store.create_snapshot.assert_called_once()
         mock_client.close.assert_called_once()
         mock_store.close.assert_called_once()
 
@@ -238,8 +277,7 @@ class TestCmdFetch:
         mock_client_class.return_value = mock_client
 
         mock_store = Mock()
-        mock_store.save_snapshot.return_value = 1
-        mock_store.get_snapshot_by_id.return_value = mock_snapshot
+        mock_store.create_snapshot.return_value = mock_snapshot
         mock_store_class.return_value = mock_store
 
         mock_args.json = True
@@ -370,8 +408,7 @@ class TestCmdRun:
 
         mock_store = Mock()
         mock_store.get_snapshot_before.return_value = None
-        mock_store.save_snapshot.return_value = 1
-        mock_store.get_snapshot_by_id.return_value = mock_snapshot
+        mock_store.create_snapshot.return_value = mock_snapshot
         mock_store.save_diff.return_value = 1
         mock_store_class.return_value = mock_store
 
@@ -382,6 +419,28 @@ class TestCmdRun:
         mock_bgpq4.close.assert_called_once()
         mock_store.close.assert_called_once()
 
+    @patch('app.cli.TicketingClient')
+    @patch('app.cli.SnapshotStore')
+    @patch('app.cli.BGPQ4Client')
+    def test_run_prints_diff_summary_block(self, mock_bgpq4_class, mock_store_class, mock_ticket_class,
+                                           mock_config, mock_args, mock_snapshot, capsys):
+        """Test the human diff summary is printed as one contiguous block."""
+        mock_bgpq4_class.return_value.fetch_prefixes.return_value = PrefixResult(
+            ipv4_prefixes=['8.8.8.0/24', '8.8.4.0/24'],
+            ipv6_prefixes=['2001:4860::/32'],
+            sources_queried=['RADB'],
+            errors=[],
+        )
+        mock_store = mock_store_class.return_value
+        mock_store.get_snapshot_before.return_value = None
+        mock_store.create_snapshot.return_value = mock_snapshot
+        mock_store.save_diff.return_value = 1
+
+        cmd_run(mock_config, mock_args)
+
+        out = capsys.readouterr().out
+        assert "Changes detected:\n  - Added IPv4: 2 prefixes\n  - Added IPv6: 1 prefixes\n" in out
+
     @patch('app.cli.TicketingClient')
     @patch('app.cli.SnapshotStore')
     @patch('app.cli.BGPQ4Client')
@@ -434,6 +493,90 @@ class TestCmdRunAll:
 
         assert result == 1  # Should return 1 if any failed
 
+    @patch('app.cli.TicketingClient')
+    @patch('app.cli.SnapshotStore')
+    @patch('app.cli.create_irr_client')
+    @patch('app.cli.cmd_run')
+    def test_run_all_shares_clients(self, mock_cmd_run, mock_create_client, mock_store_class,
+                                    mock_ticket_class, mock_config, mock_args):
+        """Test run-all sets up the client, store and ticketing once for all targets."""
+        mock_cmd_run.return_value = 0
+
+        cmd_run_all(mock_config, mock_args)
+
+        mock_create_client.assert_called_once()
+        mock_store_class.assert_called_once()
+        mock_store_class.return_value.migrate.assert_called_once()
+        mock_ticket_class.assert_called_once()
+        for call in mock_cmd_run.call_args_list:
+            assert call.kwargs['client'] is mock_create_client.return_value
+            assert call.kwargs['store'] is mock_store_class.return_value
+            assert call.kwargs['ticket_client'] is mock_ticket_class.return_value
+        mock_create_client.return_value.close.assert_called_once()
+        mock_store_class.return_value.close.assert_called_once()
+        mock_ticket_class.return_value.close.assert_called_once()
+
+
+    @patch('app.cli.TicketingClient')
+    @patch('app.cli.create_irr_client')
+    @patch('app.cli.cmd_run')
+    def test_run_all_runs_targets_concurrently(self, mock_cmd_run, mock_create_client,
+                                               mock_ticket_class, mock_config, mock_args, tmp_path):
+        """Test run-all overlaps targets and gives each worker its own clients and store."""
+        import threading
+        mock_config.database.path = str(tmp_path / 'irr.sqlite')
+        mock_config.concurrency = 2
+        barrier = threading.Barrier(2, timeout=5)
+        stores = {}
+        clients = {}
+        mock_create_client.side_effect = lambda config: MagicMock()
+
+        def run(config, run_args, client, store, ticket_client):
+            barrier.wait()  # Only returns once both targets are running at once
+            stores[run_args.target] = store
+            clients[run_args.target] = client
+            return 0 if run_args.target == 'AS15169' else 1
+
+        mock_cmd_run.side_effect = run
+        mock_args.json = True
+
+        with patch('builtins.print') as mock_print:
+            result = cmd_run_all(mock_config, mock_args)
+
+        assert result == 1
+        assert stores['AS15169'] is not stores['AS16509']
+        assert clients['AS15169'] is not clients['AS16509']
+        assert mock_create_client.call_count == 2
+        assert mock_ticket_class.call_count == 2
+        summary = json.loads(mock_print.call_args[0][0])
+        assert [r['target'] for r in summary['results']] == ['AS15169', 'AS16509']
+        assert [r['status'] for r in summary['results']] == ['success', 'failed']
+
+    @patch('subprocess.Popen')
+    def test_run_all_bgpq4_queries_overlap(self, mock_popen, mock_config, mock_args, tmp_path):
+        """Test run-all really runs every target's bgpq4 queries at the same time."""
+        import io
+        import threading
+        mock_config.database.path = str(tmp_path / 'irr.sqlite')
+        mock_config.ticketing = TicketingConfig()
+        mock_config.concurrency = 2
+        # Two targets, one IPv4 and one IPv6 query each.
+        barrier = threading.Barrier(4, timeout=5)
+
+        def popen(cmd, **kwargs):
+            barrier.wait()
+            proc = MagicMock()
+            proc.stdout = io.BufferedReader(io.BytesIO(b'{"pl": [{"prefix": "8.8.8.0/24"}]}'))
+            proc.stderr = io.BufferedReader(io.BytesIO(b''))
+            proc.wait.return_value = 0
+            return proc
+
+        mock_popen.side_effect = popen
+        mock_args.quiet = True
+
+        assert cmd_run_all(mock_config, mock_args) == 0
+        assert mock_popen.call_count == 4
+
 
 class TestCmdHistory:
     """Tests for history command."""
@@ -442,7 +585,7 @@ class TestCmdHistory:
     def test_history_no_snapshots(self, mock_store_class, mock_config, mock_args):
         """Test history when no snapshots exist."""
         mock_store = Mock()
-        mock_store.get_snapshot_history.return_value = []
+        mock_store.get_snapshot_history_summary.return_value = []
         mock_store_class.return_value = mock_store
 
         result = cmd_history(mock_config, mock_args)
@@ -454,20 +597,20 @@ class TestCmdHistory:
     def test_history_with_snapshots(self, mock_store_class, mock_config, mock_args, mock_snapshot):
         """Test history with existing snapshots."""
         mock_store = Mock()
-        mock_store.get_snapshot_history.return_value = [mock_snapshot]
+        mock_store.get_snapshot_history_summary.return_value = [mock_snapshot]
         mock_store_class.return_value = mock_store
 
         result = cmd_history(mock_config, mock_args)
 
         assert result == 0
-        mock_store.get_snapshot_history.assert_called_once_with('AS15169', 10)
+        mock_store.get_snapshot_history_summary.assert_called_once_with('AS15169', 10)
         mock_store.close.assert_called_once()
 
     @patch('app.cli.SnapshotStore')
     def test_history_json_output(self, mock_store_class, mock_config, mock_args, mock_snapshot, capsys):
         """Test history with JSON output."""
         mock_store = Mock()
-        mock_store.get_snapshot_history.return_value = [mock_snapshot]
+        mock_store.get_snapshot_history_summary.return_value = [mock_snapshot]
         mock_store_class.return_value = mock_store
 
         mock_args.json = True
@@ -476,14 +619,16 @@ class TestCmdHistory:
         assert result == 0
         captured = capsys.readouterr()
         output = json.loads(captured.out)
-        assert output['target'] == 'AS15169'
-        assert len(output['snapshots']) == 1
+        assert len(output) == 1
+        assert output[0]['target'] == 'AS15169'
+        assert len(output[0]['snapshots']) == 1
+        assert output[0]['snapshots'][0]['ipv4_count'] == 2
 
 
 class TestMain:
     """Tests for main entry point."""
 
-    @patch('app.cli.load_config')
+    @patch('app.cli.load_config_cached')
     @patch('app.cli.setup_logging')
     def test_main_no_command(self, mock_setup, mock_load, capsys):
         """Test main with no command."""
@@ -491,7 +636,7 @@ class TestMain:
             result = main()
         assert result == 1
 
-    @patch('app.cli.load_config')
+    @patch('app.cli.load_config_cached')
     @patch('app.cli.setup_logging')
     @patch('app.cli.cmd_init_db')
     def test_main_init_db(self, mock_cmd, mock_setup, mock_load, mock_config):
@@ -505,7 +650,31 @@ class TestMain:
         assert result == 0
         mock_cmd.assert_called_once()
 
-    @patch('app.cli.load_config')
+    @patch('app.cli.load_config_cached')
+    @patch('app.cli.setup_logging')
+    @patch('app.cli.cmd_run')
+    def test_main_reuses_parser(self, mock_cmd, mock_setup, mock_load, mock_config):
+        """Test repeated main() calls share one parser without leaking arguments."""
+        mock_load.return_value = mock_config
+        mock_cmd.return_value = 0
+
+        with patch('app.cli.create_parser', wraps=create_parser) as mock_create, \
+             patch('app.cli._PARSER', None):
+            # The first call omits --dry-run, so the fresh parser must supply it.
+            with patch.object(sys, 'argv', ['irr-cli', 'run', '-t', 'AS1']):
+                main()
+            with patch.object(sys, 'argv', ['irr-cli', 'run', '-t', 'AS2', '--dry-run']):
+                main()
+            with patch.object(sys, 'argv', ['irr-cli', 'run', '-t', 'AS3']):
+                main()
+
+        mock_create.assert_called_once()
+        first, second, third = (c.args[1] for c in mock_cmd.call_args_list)
+        assert (first.target, first.dry_run) == ('AS1', False)
+        assert (second.target, second.dry_run) == ('AS2', True)
+        assert (third.target, third.dry_run) == ('AS3', False)
+
+    @patch('app.cli.load_config_cached')
     def test_main_config_not_found(self, mock_load, capsys):
         """Test main when config file not found."""
         mock_load.side_effect = FileNotFoundError("Config not found")
@@ -517,7 +686,7 @@ class TestMain:
         captured = capsys.readouterr()
         assert 'ERROR' in captured.err
 
-    @patch('app.cli.load_config')
+    @patch('app.cli.load_config_cached')
     @patch('app.cli.setup_logging')
     @patch('app.cli.cmd_fetch')
     def test_main_keyboard_interrupt(self, mock_cmd, mock_setup, mock_load, mock_config):
@@ -530,6 +699,22 @@ class TestMain:
 
         assert result == 130
 
+    def test_import_defers_command_dependencies(self):
+        """Test importing the CLI does not load the store or HTTP clients."""
+        import subprocess
+        code = (
+            "import sys, app.cli; "
+            "print(','.join(m for m in ('sqlite3', 'requests', 'app.store') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == ""
+
+    def test_lazy_attribute_resolves(self):
+        """Test command dependencies are still reachable as module attributes."""
+        import app.cli
+        from app.store import SnapshotStore
+        assert app.cli.SnapshotStore is SnapshotStore
+
 
 class TestUtilityFunctions:
     """Tests for utility functions."""
@@ -540,6 +725,48 @@ class TestUtilityFunctions:
         assert isinstance(ts, str)
         assert len(ts) == 19
 
+    def test_get_timestamp_str_reused_within_second(self):
+        """Test the formatted timestamp is reused until the second changes."""
+        with patch('app.cli.time.time', return_value=1700000000.2):
+            first = get_timestamp_str()
+        with patch('app.cli.time.time', return_value=1700000000.9), \
+             patch('app.cli.time.strftime') as mock_strftime:
+            assert get_timestamp_str() == first
+        mock_strftime.assert_not_called()
+        with patch('app.cli.time.time', return_value=1700000001.0):
+            assert get_timestamp_str() != first
+
+    def test_dumps_compact_with_and_without_orjson(self):
+        """Test JSON output is compact and identical with either encoder."""
+        from app.cli import _dumps
+        payload = {'target': 'AS15169', 'prefixes': ('8.8.8.0/24',), 'count': 1}
+        expected = '{"target":"AS15169","prefixes":["8.8.8.0/24"],"count":1}'
+        with patch('app.cli.orjson', None):
+            assert _dumps(payload) == expected
+        pytest.importorskip('orjson')
+        assert _dumps(payload) == expected
+
+    def test_ts_helpers_match_datetime(self):
+        """Test the strftime helpers format like the datetime calls they replace."""
+        from datetime import datetime
+        from app.cli import _ts_iso, _ts_human
+        t = 1700000000
+        assert _ts_iso(t) == datetime.fromtimestamp(t).isoformat()
+        assert _ts_human(t) == datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S")
+
+    def test_ensure_schema_migrates_each_file_once(self, tmp_path):
+        """Test file databases are migrated once per process, :memory: every time."""
+        from app.cli import _ensure_schema
+        file_store = Mock(db_path=str(tmp_path / 'irr.sqlite'))
+        _ensure_schema(file_store)
+        _ensure_schema(file_store)
+        file_store.migrate.assert_called_once()
+
+        memory_store = Mock(db_path=':memory:')
+        _ensure_schema(memory_store)
+        _ensure_schema(memory_store)
+        assert memory_store.migrate.call_count == 2
+
     def test_print_output_quiet_mode(self, capsys):
         """Test print_output respects quiet mode."""
         print_output("Test message", quiet=True)
@@ -13,6 +13,7 @@ from app.config import (
     LoggingConfig,
     DiffConfig,
     load_config,
+    load_config_cached,
     validate_config,
     get_default_config,
     ConfigValidationError,
@@ -92,6 +93,11 @@ class TestExpandEnvVars:
             result = _expand_env_vars("${HOST}:${PORT}")
             assert result == "localhost:8080"
 
+    def test_expand_without_marker_returns_input(self):
+        """Test strings without ${ are returned as-is."""
+        value = "plain $HOME {value}"
+        assert _expand_env_vars(value) is value
+
     def test_expand_recursive_dict(self):
         """Test recursive expansion in dict."""
         with patch.dict(os.environ, {'API_KEY': 'secret'}):
@@ -107,6 +113,37 @@ class TestExpandEnvVars:
             result = _expand_env_vars_recursive(data)
             assert result == ['value', 'static']
 
+    def test_expand_recursive_in_place(self):
+        """Test containers are updated in place rather than rebuilt."""
+        with patch.dict(os.environ, {'VAR': 'value'}):
+            inner = ['${VAR}', 1]
+            data = {'list': inner, 'plain': 'x'}
+            result = _expand_env_vars_recursive(data)
+            assert result is data
+            assert data['list'] is inner
+            assert inner == ['value', 1]
+
+    def test_expand_deep_nesting(self):
+        """Test nesting deeper than the recursion limit is expanded."""
+        import sys
+        with patch.dict(os.environ, {'VAR': 'value'}):
+            leaf = ['${VAR}']
+            data = leaf
+            for _ in range(sys.getrecursionlimit() + 100):
+                data = {'n': data}
+            _expand_env_vars_recursive(data)
+            assert leaf == ['value']
+
+    def test_expand_self_referencing_alias(self):
+        """Test a YAML alias that contains itself is expanded without looping."""
+        import yaml
+        with patch.dict(os.environ, {'VAR': 'value'}):
+            data = yaml.safe_load("targets: &x ['${VAR}', *x]")
+            _expand_env_vars_recursive(data)
+            targets = data['targets']
+            assert targets[0] == 'value'
+            assert targets[1] is targets
+
     def test_expand_non_string(self):
         """Test that non-strings are returned unchanged."""
         result = _expand_env_vars_recursive(42)
@@ -207,6 +244,27 @@ class TestValidateConfig:
             validate_config(config)
         assert "logging.format must be one of" in str(exc_info.value)
 
+    def test_validate_zero_concurrency(self):
+        """Test validation fails when run-all would have no workers."""
+        config = Config(concurrency=0)
+        with pytest.raises(ConfigValidationError) as exc_info:
+            validate_config(config)
+        assert "concurrency must be at least 1" in str(exc_info.value)
+
+    def test_validate_memoizes_identical_configs(self):
+        """Test identical configs reuse the cached result, including failures."""
+        from app.config import _validation_errors
+        _validation_errors.cache_clear()
+
+        validate_config(Config())
+        validate_config(Config())
+        for _ in range(2):
+            with pytest.raises(ConfigValidationError):
+                validate_config(Config(bgpq4=BGPQ4Config(sources=['UNKNOWN'])))
+
+        info = _validation_errors.cache_info()
+        assert (info.misses, info.hits) == (2, 2)
+
     def test_validate_multiple_errors(self):
         """Test validation reports multiple errors."""
         config = Config(
@@ -229,6 +287,13 @@ class TestLoadConfig:
         with pytest.raises(FileNotFoundError):
             load_config("/nonexistent/path/config.yaml")
 
+    def test_load_config_recursive_alias(self, tmp_path):
+        """Test a self-referencing alias does not hang loading."""
+        path = tmp_path / 'config.yaml'
+        path.write_text("targets: &x [AS1, *x]\n")
+        config = load_config(str(path))
+        assert config.targets[0] == 'AS1'
+
     def test_load_config_basic(self):
         """Test loading a basic config file."""
         config_content = """
@@ -277,6 +342,34 @@ database:
             assert config.database.path == '/custom/path.db'
             os.unlink(f.name)
 
+    def test_load_config_env_override_table(self):
+        """Test each override, stripping where enabled and ignoring blank values."""
+        config_content = """
+ticketing:
+  base_url: https://from-file.example.com
+logging:
+  level: INFO
+"""
+        env = {
+            'IRR_API_URL': 'https://api.example.com',
+            'ABC_BASE_URL': '  https://env.example.com  ',
+            'ABC_TOKEN': '   ',
+            'IRR_LOG_FORMAT': 'text',
+            'TEAMS_WEBHOOK_URL': ' https://hooks.example.com ',
+        }
+        with patch.dict(os.environ, env):
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+                f.write(config_content)
+                f.flush()
+                config = load_config(f.name)
+            os.unlink(f.name)
+
+        assert config.api_url == 'https://api.example.com'
+        assert config.ticketing.base_url == 'https://env.example.com'
+        assert config.ticketing.api_token == ''
+        assert (config.logging.level, config.logging.format) == ('INFO', 'text')
+        assert config.teams.webhook_url == 'https://hooks.example.com'
+
     def test_load_config_ticketing_env_vars(self):
         """Test ticketing config from environment variables."""
         config_content = """
@@ -364,3 +457,52 @@ bgpq4:
         # Users must use a YAML list, not a comma-separated scalar.
         assert "Unknown BGPQ4 source" in str(exc_info.value)
         assert "RADB,RPKI" in str(exc_info.value)
+
+
+class TestLoadConfigCached:
+    """Tests for the mtime/size-validated config cache."""
+
+    def _write(self, tmp_path, content):
+        path = tmp_path / "config.yaml"
+        path.write_text(content)
+        return str(path)
+
+    def test_repeat_load_skips_parse(self, tmp_path):
+        path = self._write(tmp_path, "targets:\n  - AS15169\n")
+
+        first = load_config_cached(path)
+        with patch('app.config.load_config') as mock_load:
+            second = load_config_cached(path)
+
+        mock_load.assert_not_called()
+        assert second.targets == ['AS15169']
+        assert second is not first
+
+    def test_returned_config_is_a_copy(self, tmp_path):
+        path = self._write(tmp_path, "logging:\n  level: INFO\n")
+
+        load_config_cached(path).logging.level = 'DEBUG'
+
+        assert load_config_cached(path).logging.level == 'INFO'
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        path = self._write(tmp_path, "targets:\n  - AS15169\n")
+        load_config_cached(path)
+
+        self._write(tmp_path, "targets:\n  - AS15169\n  - AS-GOOGLE\n")
+
+        assert load_config_cached(path).targets == ['AS15169', 'AS-GOOGLE']
+
+    def test_environment_change_is_reparsed(self, tmp_path):
+        path = self._write(tmp_path, "ticketing:\n  api_token: ${CACHE_TEST_TOKEN}\n")
+        with patch.dict(os.environ, {'CACHE_TEST_TOKEN': 'one', 'IRR_DB_PATH': '/tmp/a.sqlite'}):
+            first = load_config_cached(path)
+        with patch.dict(os.environ, {'CACHE_TEST_TOKEN': 'two', 'IRR_DB_PATH': '/tmp/b.sqlite'}):
+            second = load_config_cached(path)
+
+        assert (first.ticketing.api_token, first.database.path) == ('one', '/tmp/a.sqlite')
+        assert (second.ticketing.api_token, second.database.path) == ('two', '/tmp/b.sqlite')
+
+    def test_missing_file_raises(self):
+        with pytest.raises(FileNotFoundError):
+            load_config_cached("/nonexistent/path/config.yaml")
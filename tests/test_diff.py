@@ -9,7 +9,7 @@ from app.diff import (
     format_diff_json,
     DiffResult,
 )
-from app.store import Snapshot
+from app.store import Snapshot, compute_content_hash
 
 
 def create_snapshot(
@@ -19,15 +19,17 @@ def create_snapshot(
     ipv6: list = None,
 ) -> Snapshot:
     """Helper to create a snapshot for testing."""
+    ipv4 = ipv4 or []
+    ipv6 = ipv6 or []
     return Snapshot(
         id=id,
         target=target,
         target_type="asn",
         timestamp=1000000 + id,
         irr_sources=["RADB"],
-        ipv4_prefixes=ipv4 or [],
-        ipv6_prefixes=ipv6 or [],
-        content_hash="hash",
+        ipv4_prefixes=ipv4,
+        ipv6_prefixes=ipv6,
+        content_hash=compute_content_hash(ipv4, ipv6),
         created_at=1000000 + id,
     )
 
@@ -53,6 +55,24 @@ class TestComputeDiffHash:
         )
         assert hash1 == hash2
 
+    def test_hash_format_unchanged(self):
+        """Streaming must hash the same bytes as encoding the whole diff at once."""
+        import hashlib
+        import json
+        diff = {
+            'target': "AS-ÜBER",
+            'added_v4': ["2.0.0.0/8", "1.0.0.0/8"],
+            'removed_v4': [],
+            'added_v6': ["2001::/32"],
+            'removed_v6': ["2002::/32", "2001:db8::/32"],
+        }
+        expected = hashlib.sha256(json.dumps(
+            {k: sorted(v) if isinstance(v, list) else v for k, v in diff.items()},
+            sort_keys=True,
+        ).encode('utf-8')).hexdigest()
+
+        assert compute_diff_hash(**diff) == expected
+
     def test_order_independent(self):
         """Hash should be independent of input order."""
         hash1 = compute_diff_hash(
@@ -118,11 +138,37 @@ class TestComputeDiff:
 
         diff = compute_diff(new, old)
 
-        assert diff.added_v4 == []
-        assert diff.removed_v4 == []
-        assert diff.added_v6 == []
-        assert diff.removed_v6 == []
+        assert diff.added_v4 == ()
+        assert diff.removed_v4 == ()
+        assert diff.added_v6 == ()
+        assert diff.removed_v6 == ()
+        assert diff.has_changes is False
+
+    def test_equal_hashes_skip_comparison(self):
+        """Test matching content hashes short-circuit with the usual empty-diff hash."""
+        old = create_snapshot(1, ipv4=["1.0.0.0/8"], ipv6=["2001::/32"])
+        new = create_snapshot(2, ipv4=["1.0.0.0/8"], ipv6=["2001::/32"])
+        # Prefix lists that would fail if compared element by element
+        new.ipv4_prefixes = old.ipv4_prefixes = None
+
+        diff = compute_diff(new, old)
+
         assert diff.has_changes is False
+        assert diff.added_v4 == () and diff.removed_v6 == ()
+        assert (diff.new_snapshot_id, diff.old_snapshot_id) == (2, 1)
+        assert diff.diff_hash == ""
+
+    def test_diff_hash_only_set_for_changes(self):
+        """Test unchanged diffs skip hashing and changed ones are hashed."""
+        old = create_snapshot(1, ipv4=["1.0.0.0/8"])
+        same = create_snapshot(2, ipv4=["1.0.0.0/8"])
+        same.content_hash = ""  # Force the full comparison path
+        changed = create_snapshot(3, ipv4=["1.0.0.0/8", "2.0.0.0/8"])
+
+        assert compute_diff(same, old).diff_hash == ""
+        assert compute_diff(changed, old).diff_hash == compute_diff_hash(
+            "AS15169", ["2.0.0.0/8"], [], [], []
+        )
 
     def test_additions_only(self):
         """Test when only additions are made."""
@@ -131,10 +177,10 @@ class TestComputeDiff:
 
         diff = compute_diff(new, old)
 
-        assert diff.added_v4 == ["2.0.0.0/8"]
-        assert diff.removed_v4 == []
-        assert diff.added_v6 == ["2001::/32"]
-        assert diff.removed_v6 == []
+        assert diff.added_v4 == ("2.0.0.0/8",)
+        assert diff.removed_v4 == ()
+        assert diff.added_v6 == ("2001::/32",)
+        assert diff.removed_v6 == ()
         assert diff.has_changes is True
 
     def test_removals_only(self):
@@ -144,10 +190,10 @@ class TestComputeDiff:
 
         diff = compute_diff(new, old)
 
-        assert diff.added_v4 == []
-        assert diff.removed_v4 == ["2.0.0.0/8"]
-        assert diff.added_v6 == []
-        assert diff.removed_v6 == ["2001::/32"]
+        assert diff.added_v4 == ()
+        assert diff.removed_v4 == ("2.0.0.0/8",)
+        assert diff.added_v6 == ()
+        assert diff.removed_v6 == ("2001::/32",)
         assert diff.has_changes is True
 
     def test_mixed_changes(self):
@@ -157,10 +203,10 @@ class TestComputeDiff:
 
         diff = compute_diff(new, old)
 
-        assert diff.added_v4 == ["3.0.0.0/8"]
-        assert diff.removed_v4 == ["2.0.0.0/8"]
-        assert diff.added_v6 == ["2002::/32"]
-        assert diff.removed_v6 == ["2001::/32"]
+        assert diff.added_v4 == ("3.0.0.0/8",)
+        assert diff.removed_v4 == ("2.0.0.0/8",)
+        assert diff.added_v6 == ("2002::/32",)
+        assert diff.removed_v6 == ("2001::/32",)
         assert diff.has_changes is True
 
     def test_first_snapshot(self):
@@ -170,10 +216,10 @@ class TestComputeDiff:
         diff = compute_diff(new, None)
 
         # All current prefixes are "added"
-        assert diff.added_v4 == ["1.0.0.0/8"]
-        assert diff.removed_v4 == []
-        assert diff.added_v6 == ["2001::/32"]
-        assert diff.removed_v6 == []
+        assert diff.added_v4 == ("1.0.0.0/8",)
+        assert diff.removed_v4 == ()
+        assert diff.added_v6 == ("2001::/32",)
+        assert diff.removed_v6 == ()
         assert diff.has_changes is True
         assert diff.old_snapshot_id is None
 
@@ -183,8 +229,8 @@ class TestComputeDiff:
 
         diff = compute_diff(new, None)
 
-        assert diff.added_v4 == []
-        assert diff.added_v6 == []
+        assert diff.added_v4 == ()
+        assert diff.added_v6 == ()
         assert diff.has_changes is False
 
     def test_snapshot_ids_set(self):
@@ -208,7 +254,42 @@ class TestComputeDiff:
         diff = compute_diff(new, old)
 
         # Should be sorted
-        assert diff.added_v4 == ["10.0.0.0/8", "2.0.0.0/8", "3.0.0.0/8"]
+        assert diff.added_v4 == ("10.0.0.0/8", "2.0.0.0/8", "3.0.0.0/8")
+
+
+class TestDiffPrefixes:
+    """Tests for the merge-based prefix diff and its set fallback."""
+
+    def test_merge_matches_set_difference(self):
+        import random
+        from app.diff import _diff_prefixes, _merge_diff
+        rng = random.Random(7)
+        pool = [f"{n}.0.0.0/8" for n in range(200)]
+        for _ in range(50):
+            new = sorted(rng.sample(pool, rng.randrange(0, 80)))
+            old = sorted(rng.sample(pool, rng.randrange(0, 80)))
+            expected = (
+                tuple(sorted(set(new) - set(old))),
+                tuple(sorted(set(old) - set(new))),
+            )
+            assert _merge_diff(new, old) == expected
+            assert _diff_prefixes(new, old) == expected
+
+    def test_sorted_unique(self):
+        from app.diff import _sorted_unique
+        assert _sorted_unique(["1.0.0.0/8", "2.0.0.0/8"]) == ("1.0.0.0/8", "2.0.0.0/8")
+        assert _sorted_unique(["2.0.0.0/8", "1.0.0.0/8", "2.0.0.0/8"]) == ("1.0.0.0/8", "2.0.0.0/8")
+        assert _sorted_unique([]) == ()
+
+    def test_unsorted_or_duplicated_input_falls_back(self):
+        from app.diff import _diff_prefixes, _merge_diff
+        assert _merge_diff(["2.0.0.0/8", "1.0.0.0/8"], ["1.0.0.0/8"]) is None
+        assert _merge_diff(["1.0.0.0/8", "1.0.0.0/8"], ["1.0.0.0/8"]) is None
+        assert _merge_diff(["1.0.0.0/8"], ["3.0.0.0/8", "2.0.0.0/8"]) is None
+        assert _diff_prefixes(["3.0.0.0/8", "1.0.0.0/8", "3.0.0.0/8"], ["2.0.0.0/8"]) == (
+            ("1.0.0.0/8", "3.0.0.0/8"),
+            ("2.0.0.0/8",),
+        )
 
 
 class TestDiffResultSummary:
@@ -281,6 +362,22 @@ class TestFormatDiffHuman:
 
         assert "... and 10 more" in output
 
+    def test_format_exact_layout(self):
+        """Test the full layout: section order, signs and truncation line."""
+        diff = DiffResult(
+            target="AS15169",
+            added_v4=("1.0.0.0/8",),
+            removed_v6=tuple(f"2001:{i}::/32" for i in range(11)),
+            has_changes=True,
+        )
+        expected = "\n".join(
+            ["Changes for AS15169:", "  Added IPv4 (1):", "    + 1.0.0.0/8", "  Removed IPv6 (11):"]
+            + [f"    - 2001:{i}::/32" for i in range(10)]
+            + ["    ... and 1 more"]
+        )
+
+        assert format_diff_human(diff) == expected
+
 
 class TestFormatDiffJson:
     """Tests for JSON formatting."""
@@ -41,6 +41,31 @@ class TestComputeContentHash:
         hash1 = compute_content_hash([], [])
         assert len(hash1) == 64  # SHA256 hex length
 
+    def test_hash_format_unchanged(self):
+        """Hash must match the original dict-based encoding so stored hashes stay comparable."""
+        import hashlib
+        import json
+        v4, v6 = ['2.0.0.0/8', '1.0.0.0/8'], ['2001::/32']
+        legacy = hashlib.sha256(json.dumps(
+            {"v4": sorted(v4), "v6": sorted(v6)}, sort_keys=True
+        ).encode('utf-8')).hexdigest()
+        assert compute_content_hash(v4, v6) == legacy
+
+    def test_save_snapshot_hash_matches(self, store):
+        """save_snapshot accepts any iterable and stores the same content hash."""
+        snapshot_id = store.save_snapshot(
+            target='AS15169',
+            target_type='asn',
+            irr_sources=['RADB'],
+            ipv4_prefixes=('8.8.8.0/24', '8.8.4.0/24'),
+            ipv6_prefixes=iter(['2001:4860::/32']),
+        )
+        snapshot = store.get_snapshot_by_id(snapshot_id)
+        assert snapshot.ipv4_prefixes == ['8.8.4.0/24', '8.8.8.0/24']
+        assert snapshot.content_hash == compute_content_hash(
+            ['8.8.8.0/24', '8.8.4.0/24'], ['2001:4860::/32']
+        )
+
 
 class TestSnapshotOperations:
     """Tests for snapshot CRUD operations."""
@@ -67,6 +92,18 @@ class TestSnapshotOperations:
         assert '8.8.4.0/24' in snapshot.ipv4_prefixes
         assert '2001:4860::/32' in snapshot.ipv6_prefixes
 
+    def test_create_snapshot_matches_stored_row(self, store):
+        """Test create_snapshot returns the same snapshot a read-back would."""
+        created = store.create_snapshot(
+            target='AS15169',
+            target_type='asn',
+            irr_sources=('RADB',),
+            ipv4_prefixes=iter(['8.8.8.0/24', '8.8.4.0/24']),
+            ipv6_prefixes=['2001:4860::/32'],
+        )
+
+        assert created == store.get_snapshot_by_id(created.id)
+
     def test_get_latest_snapshot(self, store):
         """Test getting the latest snapshot."""
         # Create first snapshot
@@ -141,6 +178,98 @@ class TestSnapshotOperations:
         latest = store.get_latest_snapshot('AS99999')
         assert latest is None
 
+    def test_get_snapshot_history_summary(self, store):
+        """Test summaries carry counts without the prefix lists."""
+        for i in range(3):
+            store.save_snapshot(
+                target='AS15169',
+                target_type='asn',
+                irr_sources=['RADB'],
+                ipv4_prefixes=[f'{n}.0.0.0/8' for n in range(i + 1)],
+                ipv6_prefixes=['2001::/32'],
+            )
+        history = store.get_snapshot_history_summary('AS15169', limit=2)
+        assert [h.ipv4_count for h in history] == [3, 2]
+        assert history[0].ipv6_count == 1
+        assert history[0].irr_sources == ('RADB',)
+        assert history[0].sources_csv == 'RADB'
+        assert not hasattr(history[0], 'ipv4_prefixes')
+
+    def test_get_all_targets_summary(self, store):
+        """Test the per-target summaries match the latest snapshots."""
+        store.save_snapshot('AS2', 'asn', ['RADB'], ['2.0.0.0/8'], [])
+        store.save_snapshot('AS-SET1', 'as-set', ['RADB', 'RIPE'], ['1.0.0.0/8'], ['2001::/32'])
+
+        summaries = store.get_all_targets_summary()
+        latest = store.get_all_targets()
+
+        assert [s.target for s in summaries] == [s.target for s in latest]
+        for summary, snapshot in zip(summaries, latest):
+            assert summary.id == snapshot.id
+            assert summary.target_type == snapshot.target_type
+            assert summary.irr_sources == tuple(snapshot.irr_sources)
+            assert (summary.ipv4_count, summary.ipv6_count) == (
+                snapshot.ipv4_count, snapshot.ipv6_count,
+            )
+
+    def test_snapshot_counts_loaded(self, store):
+        """Test snapshots read back their stored counts."""
+        snapshot_id = store.save_snapshot(
+            target='AS15169',
+            target_type='asn',
+            irr_sources=['RADB'],
+            ipv4_prefixes=['8.8.8.0/24', '8.8.4.0/24'],
+            ipv6_prefixes=[],
+        )
+        snapshot = store.get_snapshot_by_id(snapshot_id)
+        assert (snapshot.ipv4_count, snapshot.ipv6_count) == (2, 0)
+
+    def test_migrate_backfills_counts(self, tmp_path):
+        """Test migrating a database created before the count columns."""
+        import sqlite3
+        db_path = str(tmp_path / 'old.sqlite')
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            """
+            CREATE TABLE snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                target_type TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                irr_sources TEXT NOT NULL,
+                ipv4_prefixes TEXT NOT NULL,
+                ipv6_prefixes TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                created_at INTEGER NOT NULL
+            );
+            INSERT INTO snapshots VALUES
+                (1, 'AS1', 'asn', 1, '["RADB"]', '["1.0.0.0/8", "2.0.0.0/8"]', '[]', 'h', 1);
+            """
+        )
+        conn.close()
+
+        old = SnapshotStore(db_path)
+        old.migrate()
+        old.migrate()  # idempotent
+        summary = old.get_snapshot_history_summary('AS1')
+        old.close()
+
+        assert (summary[0].ipv4_count, summary[0].ipv6_count) == (2, 0)
+
+    def test_file_database_uses_wal(self, tmp_path):
+        """Test file-backed stores open in WAL mode with NORMAL sync."""
+        wal_store = SnapshotStore(str(tmp_path / 'wal.sqlite'))
+        journal_mode = wal_store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = wal_store.conn.execute("PRAGMA synchronous").fetchone()[0]
+        cache_size = wal_store.conn.execute("PRAGMA cache_size").fetchone()[0]
+        mmap_size = wal_store.conn.execute("PRAGMA mmap_size").fetchone()[0]
+        wal_store.close()
+
+        assert journal_mode == 'wal'
+        assert synchronous == 1  # NORMAL
+        assert cache_size == -65536
+        assert mmap_size == 0  # no per-connection address-space reservation
+
 
 class TestDiffOperations:
     """Tests for diff CRUD operations."""
@@ -178,7 +307,7 @@ class TestDiffOperations:
         diff = store.get_diff_by_id(diff_id)
         assert diff is not None
         assert diff.target == 'AS15169'
-        assert diff.added_v4 == ['2.0.0.0/8']
+        assert diff.added_v4 == ('2.0.0.0/8',)
         assert diff.has_changes is True
 
     def test_get_diff_by_hash(self, store):
@@ -312,6 +441,27 @@ class TestTransactions:
         snapshot = store.get_latest_snapshot('AS66666')
         assert snapshot is not None
 
+    def test_transaction_blocks_other_threads(self, store):
+        """Test another thread sharing the store waits for an open transaction."""
+        import threading
+        seen = []
+        reader = threading.Thread(target=lambda: seen.append(store.get_latest_snapshot('AS55555')))
+
+        with store.transaction():
+            store.save_snapshot(
+                target='AS55555',
+                target_type='asn',
+                irr_sources=['RIPE'],
+                ipv4_prefixes=['5.5.5.0/24'],
+                ipv6_prefixes=[],
+            )
+            reader.start()
+            reader.join(0.2)
+            assert reader.is_alive()  # not reading the uncommitted row
+
+        reader.join(5)
+        assert seen[0].ipv4_prefixes == ['5.5.5.0/24']
+
 
 class TestTicketOperations:
     """Tests for ticket CRUD operations."""
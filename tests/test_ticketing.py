@@ -216,6 +216,31 @@ class TestTicketingClient:
         assert response.status == 'failed'
         assert "Connection failed" in response.error_message
 
+    @patch('requests.Session.post')
+    def test_retry_budget_is_per_ticket(self, mock_post, diff_result):
+        """Test the shared retry policy gives every submission its own attempts."""
+        ok = Mock(status_code=201)
+        ok.json.return_value = {'ticket_id': 'TKT-1', 'status': 'created'}
+        failure = requests.RequestException("Connection failed")
+        mock_post.side_effect = [failure, ok, failure, ok]
+
+        client = TicketingClient(
+            base_url="https://api.example.com",
+            api_token="token",
+            max_retries=2,
+        )
+        client._retrying.sleep = lambda seconds: None
+
+        for _ in range(2):
+            response = client.create_ticket(
+                target="AS15169",
+                diff=diff_result,
+                irr_sources=["RADB"],
+            )
+            assert response.status == 'created'
+
+        assert mock_post.call_count == 4
+
     def test_get_payload(self, diff_result):
         """Test getting payload without submitting."""
         client = TicketingClient(